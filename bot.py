@@ -3,11 +3,12 @@ os.environ["DISCORD_NO_AUDIO"] = "1"  # must be set before importing discord (Py
 
 import random
 import re
+import signal
 import json
 import requests
 import urllib.parse
 import asyncio
-import datetime
+import time
 import xml.etree.ElementTree as ET
 from collections import Counter
 
@@ -18,17 +19,32 @@ import aiohttp
 
 from numbers_solver import solve_numbers
 from parser import parse_numbers_solution, normalize_expression
-
-# === Configuration ===
-CONUNDRUM_CHANNEL_ID = 1424500871365918761
-NUMBERS_CHANNEL_ID = 1431380518179573911
-LETTERS_CHANNEL_ID = 1438454341920100423
-
-# ✅ Test channels
-TEST_GENERAL_CHANNEL_ID = 1424857126878052413
-TEST_CONUNDRUMS_CHANNEL_ID = 1433910612009816356
-TEST_NUMBERS_CHANNEL_ID = 1430278725739479153
-TEST_LETTERS_CHANNEL_ID = 1436448481182220328
+from focaltools import FocalToolsClient, FocalToolsUnavailable
+from response_store import ResponseStore
+from wordlists import load_word_lists, rebuild_word_lists, word_files_changed
+from conundrum_meta import MIN_ROUNDS, TIERS, OutcomeLog, load_conundrum_meta, rebuild_conundrum_meta
+from deck import DeckStore
+from score_db import ScoreDB
+from score_log import ScoreLog, apply_event, load_scores, read_events
+from score_windows import ScoreWindows
+from speed_stats import SpeedStats
+from persistence import atomic_write_json, copy_json_tree
+from rank_index import RankIndex
+from channel_actor import ChannelActor
+from scheduler import Scheduler
+from round_state import RoundStateFile
+
+# === Configuration (channel IDs live in config.py) ===
+from config import (
+    TEST_GENERAL_CHANNEL_ID, TEST_CONUNDRUMS_CHANNEL_ID, TEST_NUMBERS_CHANNEL_ID, TEST_LETTERS_CHANNEL_ID,
+    GAME_CHANNELS, SCORES_FILE,
+)
+
+# Shared FocalTools client: every API lookup goes through its response cache,
+# which is backed by an on-disk store so restarts don't re-fetch everything
+RESPONSE_STORE_FILE = "focaltools_cache.sqlite3"
+response_store = ResponseStore(RESPONSE_STORE_FILE)
+focaltools = FocalToolsClient(store=response_store)
 
 intents = discord.Intents.default()
 intents.message_content = True
@@ -83,6 +99,49 @@ NUMBER_EMOJI_MAP = {
     100: "<:onehundred:1430640895895670901>",
 }
 
+# === FocalTools lookups with local fallback ===
+# While the circuit breaker is open, answers come from the local word history
+# (which covers words of up to nine letters, without wildcards).
+OFFLINE_NOTE = "\n-# FocalTools is unavailable right now; answered from the local word list."
+
+async def fetch_checkword(word, ip="c4c"):
+    """
+    Returns ('true'/'false' or an unexpected API response, lower-cased;
+    whether it came from the local word list because FocalTools was down).
+    """
+    try:
+        return (await focaltools.checkword(word, ip=ip)).strip().lower(), False
+    except FocalToolsUnavailable:
+        if len(word) > 9:
+            raise
+        return ("true" if history.is_valid(word) else "false"), True
+
+async def fetch_maxes(selection, ip="c4c"):
+    """Returns the longest words (upper-case) that can be made from the selection."""
+    try:
+        return [w.upper() for w in json.loads(await focaltools.getmaxes(selection, ip=ip))]
+    except FocalToolsUnavailable:
+        if "*" in selection:
+            raise
+        return history.maxes(selection)
+
+async def fetch_words(letters, ip="c4c"):
+    """Returns every word (upper-case) that can be made from the letters."""
+    try:
+        text = await focaltools.getwords(letters, ip=ip)
+    except FocalToolsUnavailable:
+        if "*" in letters:
+            raise
+        return [w for n in range(1, len(letters) + 1) for w in history.formable(letters, n)]
+
+    try:
+        parsed = json.loads(text)
+        if isinstance(parsed, list):
+            return [w.upper() for w in parsed if isinstance(w, str)]
+    except json.JSONDecodeError:
+        pass
+    return [w.upper() for w in re.findall(r"<string>(.*?)</string>", text)]
+
 # === Word validity check with historical info ===
 @bot.command(name="check", aliases=["history"])
 async def check_word(ctx, *, term: str):
@@ -93,91 +152,26 @@ async def check_word(ctx, *, term: str):
     try:
         # === Step 1: Prepare word and call API ===
         word = term.strip().upper()
-        user_identifier = ctx.author.name
-        url = f"https://focaltools.azurewebsites.net/api/checkword/{word}?ip={user_identifier}"
-
-        # --- Use aiohttp for non-blocking requests ---
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                response.raise_for_status()
-                data = (await response.text()).strip().lower()
+        data, offline = await fetch_checkword(word, ip=ctx.author.name)
 
         # === Step 2: If word is >9 letters, skip history lookup ===
         skip_history = len(word) > 9
 
-        # === Step 3: Lookup helper functions ===
-        def lookup_history(filename, word):
-            """Look up a word in the specified history file and return its associated date string."""
-            try:
-                with open(filename, "r", encoding="utf-8") as f:
-                    for line in f:
-                        parts = line.strip().split("\t")
-                        if len(parts) >= 2 and parts[0].strip().upper() == word:
-                            return parts[1].strip()
-            except FileNotFoundError:
-                return None
-            return None
-
-        def format_history_message(date_str, valid=True):
-            """Interpret the date string and return a formatted sentence."""
-            if not date_str:
-                return (
-                    "I can't find a record of when this word became valid; it was probably very recently added."
-                    if valid
-                    else "I can't find a record of this word being removed; it may never have been valid."
-                )
-
-            # === Special dictionary events ===
-            if not valid:
-                if re.search(r"06/2016", date_str):
-                    return "This word was removed in the Great OED Variant Cull of June 2016."
-                if re.search(r"08/2024", date_str):
-                    return "This word was removed in the Great Dictionary Reset of August 2024."
-
-            # === Exact date format: dd/mm/yy or dd/mm/yyyy ===
-            m = re.match(r"(\d{1,2})/(\d{1,2})/(\d{2,4})", date_str)
-            if m:
-                day, month, year = map(int, m.groups())
-                if year < 100:
-                    year += 2000
-                month_name = datetime.date(year, month, 1).strftime("%B")
-                if valid:
-                    return f"This word has been valid since {month_name} {year}."
-                else:
-                    return f"This word was removed in {month_name} {year}."
-
-            # === Between years format: between 2006 - 2012 ===
-            m = re.match(r"between\s+(\d{4})\s*[-–]\s*(\d{4})", date_str, re.IGNORECASE)
-            if m:
-                y1, y2 = m.groups()
-                if valid:
-                    return f"This word became valid sometime between {y1} and {y2}."
-                else:
-                    return f"This word was removed sometime between {y1} and {y2}."
-
-            # === Pre-2006 ===
-            if re.match(r"pre[-–]?\s*2006", date_str, re.IGNORECASE):
-                if valid:
-                    return "This word has likely always been valid."
-                else:
-                    return "This word was removed before 2006."
-
-            # Fallback
-            return f"(Unrecognized date format: {date_str})"
-
-        # === Step 4: Send response ===
+        # === Step 3: Send response ===
         if "true" in data:
             msg = f"✅ **{word}** is **VALID**"
             if not skip_history:
-                date_info = lookup_history("history_valid.txt", word)
-                msg += "\n" + format_history_message(date_info, valid=True)
+                msg += "\n" + history.describe(word, valid=True)
+            if offline:
+                msg += OFFLINE_NOTE
             await ctx.send(msg)
 
         elif "false" in data:
             msg = f"❌ **{word}** is **INVALID**"
             if not skip_history:
-                date_info = lookup_history("history_invalid.txt", word)
-                msg += "\n" + format_history_message(date_info, valid=False)
+                msg += "\n" + history.describe(word, valid=False)
+            if offline:
+                msg += OFFLINE_NOTE
             await ctx.send(msg)
 
         else:
@@ -289,26 +283,8 @@ async def maxes(ctx, *, selection: str):
             await send_limited("⚠️ Selection must contain 12 characters or fewer (including wildcards).")
             return
 
-        url = f"https://focaltools.azurewebsites.net/api/getwords/{letters}?ip=c4c"
-
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    response.raise_for_status()
-                    text = await response.text()
-
-            words = None
-            try:
-                parsed = json.loads(text)
-                if isinstance(parsed, list):
-                    words = [w.upper() for w in parsed if isinstance(w, str)]
-            except json.JSONDecodeError:
-                pass
-
-            if words is None:
-                words = re.findall(r"<string>(.*?)</string>", text)
-                words = [w.upper() for w in words]
-
+            words = await fetch_words(letters)
             words = [w for w in words if len(w) == n]
             display_letters = letters.replace('*', '?')
 
@@ -349,16 +325,8 @@ async def maxes(ctx, *, selection: str):
         await send_limited("⚠️ Selection must contain 12 characters or fewer (including wildcards).")
         return
 
-    user_identifier = urllib.parse.quote(ctx.author.name)
-    url = f"https://focaltools.azurewebsites.net/api/getmaxes/{selection}?ip={user_identifier}"
-
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                response.raise_for_status()
-                text = await response.text()
-
-        words = json.loads(text)
+        words = await fetch_maxes(selection, ip=ctx.author.name)
         display_selection = selection.replace('*', '?')
 
         if not words:
@@ -366,7 +334,7 @@ async def maxes(ctx, *, selection: str):
             return
 
         # Sort and join words; mark wildcard letters with underline if wildcards present
-        sorted_words = sorted([w.upper() for w in words])
+        sorted_words = sorted(words)
         marked = [mark_wildcards(w, selection) for w in sorted_words]
         prefix = f":arrow_up: Maxes from *{display_selection}*: **"
         suffix = "**"
@@ -400,15 +368,8 @@ async def define_word(ctx, *, term: str):
         )
         return
 
-    user_identifier = ctx.author.name
-    url = f"https://focaltools.azurewebsites.net/api/define/{term}?ip={user_identifier}"
-
     try:
-        # --- Async HTTP request using aiohttp ---
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                response.raise_for_status()
-                data = (await response.text()).strip()
+        data = (await focaltools.define(term, ip=ctx.author.name)).strip()
 
         # --- Extract text whether XML or plain ---
         if "<string" in data and "</string>" in data:
@@ -439,6 +400,9 @@ async def define_word(ctx, *, term: str):
     except asyncio.TimeoutError:
         await ctx.send("⏳ The dictionary service took too long to respond. Please try again later.")
 
+    except FocalToolsUnavailable:
+        await ctx.send("⏳ The dictionary service is unavailable right now. Please try again later.")
+
     except aiohttp.ClientError as e:
         await ctx.send(f"🌐 Network error contacting dictionary API: `{e}`")
 
@@ -550,27 +514,54 @@ async def selection(ctx, *, args: str):
             await ctx.send("⚠️ Please provide either letters (A–Z) or numbers separated by spaces.")
             return
 
-    # --- 3. The 40-Second Delay ---
-    await asyncio.sleep(40)
+    # --- 3. Auto-invoke the solvers in 40 seconds (the shared timer task waits, not this command) ---
+    async def reveal():
+        if is_letters:
+            # We pass the cleaned letters to the existing maxes command
+            # bot.get_command('maxes') finds your @bot.command(name="maxes")
+            await ctx.invoke(bot.get_command('maxes'), selection=args_clean.replace(" ", ""))
+
+        elif is_numbers:
+            # We pass the original number string to the existing solve command
+            await ctx.invoke(bot.get_command('solve'), input_text=args_clean)
+
+    timers.schedule(("selection", ctx.message.id), 40, reveal)
 
-    # --- 4. Auto-invoke the solvers ---
-    if is_letters:
-        # We pass the cleaned letters to the existing maxes command
-        # bot.get_command('maxes') finds your @bot.command(name="maxes")
-        await ctx.invoke(bot.get_command('maxes'), selection=args_clean.replace(" ", ""))
-    
-    elif is_numbers:
-        # We pass the original number string to the existing solve command
-        await ctx.invoke(bot.get_command('solve'), input_text=args_clean)
 
+# === Load words and word history (valid-since / removed-on dates) ===
+# One read of the prebuilt snapshot (see wordlists.py), falling back to the text files
+word_lists = load_word_lists()
+WORDS = word_lists.conundrums
+history = word_lists.history
+print(f"📜 Loaded {len(WORDS)} conundrums and history for {len(history.valid)} valid and {len(history.invalid)} invalid words")
 
-# === Load words ===
-WORDS = []
-with open("conundrums.txt", encoding="utf-8") as f:
-    for line in f:
-        w = line.strip()
-        if w:
-            WORDS.append(w)
+# Difficulty tiers for the conundrum picker (built by conundrum_meta.py, refreshed from solve history)
+conundrum_meta = load_conundrum_meta()
+conundrum_outcomes = OutcomeLog()  # how each conundrum went, for the next refresh
+
+word_reload_lock = asyncio.Lock()  # one reload at a time (file watcher and !reload_words)
+
+async def reload_word_lists():
+    """
+    Rebuild the word data in a worker thread, then swap it in. Rebinding the
+    globals happens on the event loop in one step, so handlers see either the
+    old lists or the new ones, and active rounds are untouched.
+    """
+    global word_lists, WORDS, history, conundrum_meta
+    async with word_reload_lock:
+        new_lists = await asyncio.to_thread(rebuild_word_lists)
+        new_meta = await asyncio.to_thread(load_conundrum_meta)
+        word_lists, WORDS, history = new_lists, new_lists.conundrums, new_lists.history
+        conundrum_meta = new_meta
+    print(f"🔄 Reloaded {len(WORDS)} conundrums and history for {len(history.valid)} valid and {len(history.invalid)} invalid words")
+
+def word_memory_lines():
+    """Memory used by the packed word lists versus plain sets of strings."""
+    return [
+        WORDS.memory_report("Conundrums"),
+        history.valid.words.memory_report("Valid history"),
+        history.invalid.words.memory_report("Invalid history"),
+    ]
 
 def scramble(word):
     letters = list(word)
@@ -634,24 +625,161 @@ current = {} # conundrums
 current_conundrum_display = {}  # tracks current scrambled arrangement for conundrums
 current_numbers = {}  # for the Numbers game
 current_letters = {}  # for the Letters game
-locks = {}              # for conundrum channels
-numbers_locks = {}      # for numbers channels
-letters_locks = {}      # for letters channels
+conundrum_started = {}     # monotonic time each conundrum was posted, None if resumed (numbers/letters rounds keep "started")
+round_ids = {}             # channel id -> id of the round in progress (for the score log)
+conundrum_difficulty = {}  # channel id -> difficulty tier to pick from (absent = any)
+conundrum_decks = DeckStore("conundrum_decks.json")  # per-channel no-repeat decks
+channel_actors = {}     # channel id -> ChannelActor handling that channel's messages in order
+guess_memos = {}        # channel id -> {normalised guess: verdict} for the round in progress
+guess_memo_stats = {game: {"hits": 0, "misses": 0} for game in ("conundrum", "numbers", "letters")}
+GUESS_MEMO_LIMIT = 5000  # distinct guesses remembered per round; later ones are just classified
+timers = Scheduler()    # reminders, idle timeouts and !selection reveals
+idle_channels = set()   # channels whose round timed out; their next message starts a new one
+ROUND_REMINDER_SECONDS = 10 * 60  # repost an unsolved puzzle after this long without messages
+ROUND_IDLE_SECONDS = 30 * 60      # give up on it after this long without messages
+ROUND_STATE_FILE = "rounds.json"  # rounds in progress, resumed after a restart
+round_store = RoundStateFile(ROUND_STATE_FILE)
+rounds_restored = False
 
 # === Leaderboard storage ===
-SCORES_FILE = "scores.json"
-try:
-    with open(SCORES_FILE, "r", encoding="utf-8") as f:
-        scores = json.load(f)
-except FileNotFoundError:
-    scores = {}
+SCORE_LOG_FILE = "score_events.log"
+SCORES_DB_FILE = "scores.sqlite3"
+SCORE_WINDOWS_FILE = "score_windows.json"
+SPEED_STATS_FILE = "speed_stats.json"
+# SCORES_BACKEND=sqlite keeps scores in SQLite (imported from scores.json on first run)
+SCORES_BACKEND = os.getenv("SCORES_BACKEND", "json").lower()
+score_db = ScoreDB(SCORES_DB_FILE, migrate_from=SCORES_FILE) if SCORES_BACKEND == "sqlite" else None
+# The snapshot is scores.json or the database; events logged since then are replayed on top
+scores, last_score_event = load_scores(SCORES_FILE, SCORE_LOG_FILE, db=score_db)
+# Daily/weekly/monthly points, saved alongside the scores on each compaction
+score_windows = ScoreWindows.load(SCORE_WINDOWS_FILE)
+# Winning times per player and game, for !speed
+speed_stats = SpeedStats.load(SPEED_STATS_FILE)
+for _event in read_events(SCORE_LOG_FILE):
+    score_windows.add(_event)
+    speed_stats.add(_event)
+score_log = ScoreLog(
+    SCORE_LOG_FILE, SCORES_FILE if score_db is None else None, lambda: scores, last_score_event, db=score_db,
+    extra_snapshots=[
+        (SCORE_WINDOWS_FILE, lambda: score_windows.buckets),
+        (SPEED_STATS_FILE, speed_stats.to_dict),
+    ],
+)
+
+def score_value(info, key):
+    """One category's score, or the combined total when key is None."""
+    if key is None:
+        return info.get("con_score", 0) + info.get("num_score", 0) + info.get("let_score", 0)
+    return info.get(key, 0)
+
+# Ranked view of each category (None = combined), kept current as points are awarded
+rank_indexes = {key: RankIndex() for key in ("con_score", "num_score", "let_score", None)}
+score_version = 0      # bumped on every award; leaderboard_cache entries from older versions are stale
+leaderboard_cache = {}  # score key (+ window) -> (version, period id, rendered leaderboard or None)
+
+def leaderboard_version():
+    """
+    Changes whenever a rendered leaderboard could: on every award, and with
+    SQLite also once the writer thread has put the award in the database.
+    """
+    return score_version if score_db is None else (score_version, score_log.db_applied)
+
+def index_player(user_id):
+    info = scores.get(user_id, {})
+    for key, index in rank_indexes.items():
+        index.update(user_id, score_value(info, key))
+
+for _uid in scores:
+    index_player(_uid)
+
+def start_round(channel_id):
+    """Give the channel's new round an id; returns its monotonic start time."""
+    round_ids[channel_id] = f"{channel_id}-{time.time_ns() // 1_000_000}"
+    guess_memos[channel_id] = {}
+    idle_channels.discard(channel_id)
+    arm_round_timers(channel_id)
+    return time.monotonic()
+
+def end_round(channel_id):
+    """Drop per-round state kept outside the game's own round dict, and its timers."""
+    guess_memos.pop(channel_id, None)
+    idle_channels.discard(channel_id)
+    timers.cancel(("reminder", channel_id))
+    timers.cancel(("idle", channel_id))
+    save_rounds()
+
+def remembered_verdict(channel_id, game, key, classify):
+    """
+    The verdict for a guess already seen this round, else classify() it and
+    remember the result, so repeats of a popular wrong answer cost one dict lookup.
+    """
+    memo = guess_memos.setdefault(channel_id, {})
+    if key in memo:
+        guess_memo_stats[game]["hits"] += 1
+        return memo[key]
+    verdict = classify()
+    guess_memo_stats[game]["misses"] += 1
+    if len(memo) < GUESS_MEMO_LIMIT:
+        memo[key] = verdict
+    return verdict
+
+def guess_memo_lines():
+    lines = []
+    for game, stats in guess_memo_stats.items():
+        seen = stats["hits"] + stats["misses"]
+        if seen:
+            lines.append(
+                f"Repeat guesses ({game}): {stats['hits']}/{seen} answered from the round memo "
+                f"({stats['hits'] / seen:.0%})"
+            )
+    return lines
+
+def round_elapsed(game, channel_id):
+    """Seconds since the channel's current round was posted, or None (no round, or an untimed resumed one)."""
+    if game == "conundrum":
+        started = conundrum_started.get(channel_id)
+    else:
+        started = (current_numbers if game == "numbers" else current_letters).get(channel_id, {}).get("started")
+    return None if started is None else time.monotonic() - started
+
+def award_points(user_id, name, game, points=1, bonus=None, channel_id=None):
+    """
+    Log a scoring event ("conundrum", "numbers" or "letters") and add it to the totals.
+    Call it before the round is cleared, so the solve time can be measured.
+    """
+    global score_version
+    seconds = round_elapsed(game, channel_id)
+    event = score_log.append(user_id, name, game, points, bonus, round_ids.get(channel_id), seconds)
+    # Derived stats before totals: a compaction that sees the point in the totals then sees it here too
+    score_windows.add(event)
+    speed_stats.add(event)
+    apply_event(scores, event)
+    index_player(user_id)
+    score_version += 1
 
 # === Bot events ===
+def pick_conundrum(channel_id):
+    """
+    Next conundrum from the channel's shuffled deck (only words in its
+    difficulty tier if one is set), so no word repeats until the whole deck
+    has been seen. Tier decks deal over WORDS and skip other tiers' words, so
+    a tier refresh doesn't restart them.
+    """
+    tier = conundrum_difficulty.get(channel_id)
+    if tier and conundrum_meta and len(conundrum_meta.tiers.get(tier, ())):
+        members = conundrum_meta.tiers[tier]
+        word = conundrum_decks.draw(f"{channel_id}:{tier}", WORDS, accept=lambda w: w in members)
+        if word is not None:  # metadata can lag behind a hot-reloaded word list
+            return word
+    return conundrum_decks.draw(f"{channel_id}:any", WORDS)
+
 async def new_puzzle(channel):
-    word = random.choice(WORDS)
+    word = pick_conundrum(channel.id)
     scrambled_word = scramble(word)
     current[channel.id] = word
     current_conundrum_display[channel.id] = scrambled_word
+    conundrum_started[channel.id] = start_round(channel.id)
+    save_rounds()
     scramble_emoji = encode_letters(scrambled_word)
     msg_template = random.choice(SCRAMBLE_MESSAGES)
     formatted_message = msg_template.format(scrambled=f"\n>{scramble_emoji}<")
@@ -664,6 +792,13 @@ async def new_puzzle(channel):
                 await asyncio.sleep(2 ** attempt)
     # Puzzle state is already set; users can type 'print' to reveal the scramble
 
+def finish_conundrum(cid, word, outcome):
+    """Log how the round went ("solved", "gaveup" or "expired") for the difficulty metadata."""
+    started = conundrum_started.pop(cid, None)
+    if started is None:
+        return
+    conundrum_outcomes.record(word, outcome, time.monotonic() - started)
+
 async def safe_react(message, emoji):
     try:
         await message.add_reaction(emoji)
@@ -671,6 +806,32 @@ async def safe_react(message, emoji):
         pass
 
 # === Moderator-only Conundrum & Numbers Commands (updated) ===
+# Round changes go through the channel's actor, in turn with the guesses being handled
+async def start_channel_round(cid):
+    """Start a new round in a quiz channel (replacing any current one)."""
+    handler, channel = CHANNEL_HANDLERS.get(cid), bot.get_channel(cid)
+    if handler is None or channel is None:
+        return
+    await channel_actor(cid, handler).call(lambda: handler.new_round(channel))
+
+async def stop_channel_round(cid, notice, always_notify=False):
+    """End a quiz channel's round without a reveal and post `notice` (if a round was on, unless always_notify)."""
+    handler = CHANNEL_HANDLERS.get(cid)
+    if handler is None:
+        return
+
+    async def stop():
+        stopped = round_in_progress(cid)
+        if stopped:
+            current.pop(cid, None)
+            current_numbers.pop(cid, None)
+            current_letters.pop(cid, None)
+            end_round(cid)
+        ch = bot.get_channel(cid)
+        if ch and (stopped or always_notify):
+            await ch.send(notice)
+
+    await channel_actor(cid, handler).call(stop)
 
 # === Test-only Commands ===
 @bot.command(name="start_tests")
@@ -681,16 +842,8 @@ async def start_tests(ctx):
         await ctx.send("⚠️ This command can't be used in this channel.")
         return
 
-    test_conundrum_channel = bot.get_channel(TEST_CONUNDRUMS_CHANNEL_ID)
-    test_numbers_channel = bot.get_channel(TEST_NUMBERS_CHANNEL_ID)
-    test_letters_channel = bot.get_channel(TEST_LETTERS_CHANNEL_ID)
-
-    if test_conundrum_channel:
-        await new_puzzle(test_conundrum_channel)
-    if test_numbers_channel:
-        await new_numbers_round(test_numbers_channel)
-    if test_letters_channel:
-        await new_letters_round(test_letters_channel)
+    for cid in (TEST_CONUNDRUMS_CHANNEL_ID, TEST_NUMBERS_CHANNEL_ID, TEST_LETTERS_CHANNEL_ID):
+        await start_channel_round(cid)
 
     await ctx.send("✅ Test quizzes started in #test_conundrums and #test_numbers and #test_letters.")
 
@@ -703,26 +856,9 @@ async def stop_tests(ctx):
         await ctx.send("⚠️ This command can't be used in this channel.")
         return
 
-    # Stop test conundrum
-    if TEST_CONUNDRUMS_CHANNEL_ID in current:
-        del current[TEST_CONUNDRUMS_CHANNEL_ID]
-        ch = bot.get_channel(TEST_CONUNDRUMS_CHANNEL_ID)
-        if ch:
-            await ch.send("🛑 Test Conundrum quiz stopped.")
-
-    # Stop test numbers
-    if TEST_NUMBERS_CHANNEL_ID in current_numbers:
-        del current_numbers[TEST_NUMBERS_CHANNEL_ID]
-        ch = bot.get_channel(TEST_NUMBERS_CHANNEL_ID)
-        if ch:
-            await ch.send("🛑 Test Numbers quiz stopped.")
-
-    # Stop test letters
-    if TEST_LETTERS_CHANNEL_ID in current_letters:
-        del current_letters[TEST_LETTERS_CHANNEL_ID]
-        ch = bot.get_channel(TEST_LETTERS_CHANNEL_ID)
-        if ch:
-            await ch.send("🛑 Test Letters quiz stopped.")
+    await stop_channel_round(TEST_CONUNDRUMS_CHANNEL_ID, "🛑 Test Conundrum quiz stopped.")
+    await stop_channel_round(TEST_NUMBERS_CHANNEL_ID, "🛑 Test Numbers quiz stopped.")
+    await stop_channel_round(TEST_LETTERS_CHANNEL_ID, "🛑 Test Letters quiz stopped.")
 
     await ctx.send("✅ Test quizzes stopped in #test_conundrums and #test_numbers and #test_letters.")
 
@@ -735,31 +871,9 @@ async def start_bots(ctx):
         await ctx.send("⚠️ This command can't be used in this channel.")
         return
 
-    # All quiz channels (main + test)
-    all_channels = [
-        bot.get_channel(CONUNDRUM_CHANNEL_ID),
-        bot.get_channel(TEST_CONUNDRUMS_CHANNEL_ID),
-        bot.get_channel(NUMBERS_CHANNEL_ID),
-        bot.get_channel(TEST_NUMBERS_CHANNEL_ID),
-        bot.get_channel(LETTERS_CHANNEL_ID),
-        bot.get_channel(TEST_LETTERS_CHANNEL_ID),
-    ]
-
-    for ch in all_channels:
-        if not ch:
-            continue
-
-        # 🧩 Conundrum Channels
-        if ch.id in [CONUNDRUM_CHANNEL_ID, TEST_CONUNDRUMS_CHANNEL_ID]:
-            await new_puzzle(ch)
-
-        # 🔢 Numbers Channels
-        elif ch.id in [NUMBERS_CHANNEL_ID, TEST_NUMBERS_CHANNEL_ID]:
-            await new_numbers_round(ch)
-
-        # 🔤 Letters Channels
-        elif ch.id in [LETTERS_CHANNEL_ID, TEST_LETTERS_CHANNEL_ID]:
-            await new_letters_round(ch)
+    # All quiz channels (main + test), each started with its game's new-round function
+    for cid in CHANNEL_HANDLERS:
+        await start_channel_round(cid)
 
     await ctx.send("✅ All bots (Conundrum, Numbers, Letters) started in all quiz channels.")
 
@@ -771,96 +885,193 @@ async def stop_bots(ctx):
         await ctx.send("⚠️ This command can't be used in this channel.")
         return
 
-    # Stop all active rounds
-    for cid in list(current.keys()):
-        del current[cid]
-    for cid in list(current_numbers.keys()):
-        del current_numbers[cid]
-    for cid in list(current_letters.keys()):
-        del current_letters[cid]
-
-    # Notify all channels
-    for ch_id in [
-        CONUNDRUM_CHANNEL_ID, TEST_CONUNDRUMS_CHANNEL_ID,
-        NUMBERS_CHANNEL_ID, TEST_NUMBERS_CHANNEL_ID,
-        LETTERS_CHANNEL_ID, TEST_LETTERS_CHANNEL_ID,
-    ]:
-        ch = bot.get_channel(ch_id)
-        if ch:
-            await ch.send("🛑 Quiz has been temporarily stopped for maintenance.")
+    # Stop all active rounds and notify all quiz channels (main + test)
+    for cid in CHANNEL_HANDLERS:
+        await stop_channel_round(cid, "🛑 Quiz has been temporarily stopped for maintenance.", always_notify=True)
 
     await ctx.send("✅ All bots (Conundrum, Numbers, Letters) stopped across all quiz channels.")
 
 
-@bot.command(name="points", aliases=["leaderboard", "score", "scores"])
-async def leaderboard(ctx):
-    """Show top solvers for either Conundrum or Numbers rounds (works in test & main channels)."""
-    if not scores:
-        await ctx.send("No scores yet!")
+@bot.command(name="difficulty")
+@commands.has_permissions(manage_messages=True)
+async def difficulty(ctx, tier: str = None):
+    """
+    Show or set the conundrum difficulty for this channel.
+    Usage: !difficulty [easy|medium|hard|any]
+    """
+    if GAME_CHANNELS.get(ctx.channel.id) != "conundrum":
+        await ctx.send("⚠️ This command can only be used in the Conundrum channels.")
         return
 
-    channel_id = ctx.channel.id
+    if tier is None:
+        current_tier = conundrum_difficulty.get(ctx.channel.id, "any")
+        if conundrum_meta:
+            sizes = ", ".join(f"{n} {t}" for t, n in conundrum_meta.tier_sizes().items())
+            await ctx.send(f"🎚️ Conundrum difficulty: **{current_tier}** ({sizes})")
+        else:
+            await ctx.send(f"🎚️ Conundrum difficulty: **{current_tier}** (no difficulty data loaded)")
+        return
 
-    # Determine which leaderboard to show
-    if channel_id in [CONUNDRUM_CHANNEL_ID, TEST_CONUNDRUMS_CHANNEL_ID]:
-        key = "con_score"
-        title = "🏆 Conundrum Leaderboard"
-    elif channel_id in [NUMBERS_CHANNEL_ID, TEST_NUMBERS_CHANNEL_ID]:
-        key = "num_score"
-        title = "🔢 Numbers Leaderboard"
-    elif channel_id in [LETTERS_CHANNEL_ID, TEST_LETTERS_CHANNEL_ID]:
-        key = "let_score"
-        title = "🔤 Countdown Letters Leaderboard"
-    else:
-        await ctx.send("⚠️ This command can only be used in the Conundrum or Numbers channels.")
+    tier = tier.lower()
+    if tier != "any" and tier not in TIERS:
+        await ctx.send("⚠️ Difficulty must be one of: easy, medium, hard, any.")
+        return
+    if tier != "any" and not conundrum_meta:
+        await ctx.send("⚠️ No difficulty data is loaded; run `python conundrum_meta.py` first.")
         return
 
-    # Filter out users with 0 in this category
-    valid_scores = {uid: info for uid, info in scores.items() if info.get(key, 0) > 0}
+    cid = ctx.channel.id
 
-    if not valid_scores:
-        await ctx.send("No scores yet for this category!")
-        return
+    async def set_tier():
+        # On the channel's actor, so a round being started meanwhile draws from one tier or the other
+        if tier == "any":
+            conundrum_difficulty.pop(cid, None)
+        else:
+            conundrum_difficulty[cid] = tier
+        save_rounds()  # kept across restarts with the rounds themselves
+
+    await channel_actor(cid, CHANNEL_HANDLERS[cid]).call(set_tier)
+    await ctx.send(f"🎚️ Conundrum difficulty set to **{tier}** from the next round.")
+
+
+# `!points <period>` arguments -> (period, how many periods back, label)
+LEADERBOARD_WINDOWS = {
+    "day": ("day", 0, "today"), "today": ("day", 0, "today"), "daily": ("day", 0, "today"),
+    "yesterday": ("day", 1, "yesterday"),
+    "week": ("week", 0, "this week"), "weekly": ("week", 0, "this week"),
+    "lastweek": ("week", 1, "last week"),
+    "month": ("month", 0, "this month"), "monthly": ("month", 0, "this month"),
+    "lastmonth": ("month", 1, "last month"),
+}
+
+def parse_window(period):
+    """None for all-time, a LEADERBOARD_WINDOWS entry, or False if the argument isn't a period."""
+    if period is None:
+        return None
+    return LEADERBOARD_WINDOWS.get(period.lower().replace(" ", "").replace("-", ""), False)
+
+def window_ranking(key, window):
+    """(period id, [(user id, entry)] with a non-zero score, highest first) for a time window."""
+    pid, bucket = score_windows.get(window[0], window[1])
+    ranked = sorted(
+        ((uid, info) for uid, info in bucket.items() if score_value(info, key) > 0),
+        key=lambda x: score_value(x[1], key),
+        reverse=True,
+    )
+    return pid, ranked
 
-    # Sort all users by score descending
-    sorted_scores = sorted(valid_scores.items(), key=lambda x: x[1][key], reverse=True)
+async def player_rank(key, user_id, window=None):
+    """
+    (rank, score) of a player all-time or in a time window, or None if they haven't
+    scored. The rank is the row leaderboard_data lists them on, ties included.
+    """
+    if window is None:
+        if score_db is not None:
+            return await asyncio.to_thread(score_db.rank, key, user_id)
+        return rank_indexes[key].rank(user_id)
+    _, ranked = window_ranking(key, window)
+    return next(
+        ((idx, score_value(info, key)) for idx, (uid, info) in enumerate(ranked, 1) if uid == user_id),
+        None,
+    )
+
+async def leaderboard_data(key, limit=15, window=None):
+    """
+    ([(name, score)] for the top `limit`, sum of all scores) for one score key,
+    or the combined total when key is None; all-time, or within a time window.
+    """
+    if window is not None:
+        # Only this period's players: a small sort
+        _, ranked = window_ranking(key, window)
+        top = [(info.get("name", "Unknown User"), score_value(info, key)) for _, info in ranked[:limit]]
+        return top, sum(score_value(info, key) for _, info in ranked)
+
+    if score_db is not None:
+        def query():
+            return [(name, value) for _, name, value in score_db.top(key, limit)], score_db.total(key)
+        return await asyncio.to_thread(query)
+
+    index = rank_indexes[key]
+    top = [(scores[uid].get("name", "Unknown User"), value) for uid, value in index.top(limit)]
+    return top, index.total
+
+async def render_leaderboard(key, title, window=None):
+    """
+    (top 15 text, total line) for a leaderboard, or None if nobody has scored.
+    Rebuilt only when a point has been awarded (and, with SQLite, written to
+    the database) since the last request.
+    """
+    cache_key, pid = key, None
+    if window is not None:
+        pid = score_windows.get(window[0], window[1])[0]
+        # One entry per window: a new period (e.g. a new day) replaces the last one's
+        cache_key = (key, window[0], window[1])
+        title = f"{title} — {window[2]} ({pid})"
+    cached = leaderboard_cache.get(cache_key)
+    if cached and cached[:2] == (leaderboard_version(), pid):
+        return cached[2]
+    version = leaderboard_version()  # a point awarded or written while we query makes this entry stale
+    top, total_rounds = await leaderboard_data(key, window=window)
+    rendered = None
+    if top:
+        body = f"**{title}**\n" + "".join(f"{idx}. {name}: {value}\n" for idx, (name, value) in enumerate(top, 1))
+        rendered = (body, f"\nTotal rounds solved: {total_rounds}")
+    leaderboard_cache[cache_key] = (version, pid, rendered)
+    return rendered
+
+PERIOD_USAGE = "⚠️ Usage: `!points [today|yesterday|week|lastweek|month|lastmonth]`"
 
-    msg = f"**{title}**\n"
-    user_id_str = str(ctx.author.id)
-    user_rank_info = None
+@bot.command(name="points", aliases=["leaderboard", "score", "scores"])
+async def leaderboard(ctx, *, period: str = None):
+    """
+    Show top solvers for either Conundrum or Numbers rounds (works in test & main channels).
+    Usage: !points [today|yesterday|week|lastweek|month|lastmonth]
+    """
+    window = parse_window(period)
+    if window is False:
+        await ctx.send(PERIOD_USAGE)
+        return
 
-    for idx, (uid, info) in enumerate(sorted_scores, 1):
-        name = info.get("name", "Unknown User")
-        score_value = info.get(key, 0)
+    if not scores:
+        await ctx.send("No scores yet!")
+        return
 
-        # Build top 15 leaderboard
-        if idx <= 15:
-            msg += f"{idx}. {name}: {score_value}\n"
+    # Determine which leaderboard to show
+    handler = CHANNEL_HANDLERS.get(ctx.channel.id)
+    if handler is None:
+        await ctx.send("⚠️ This command can only be used in the Conundrum or Numbers channels.")
+        return
+    key, title = handler.score_key, handler.title
 
-        # Check if this is the command user
-        if str(uid) == user_id_str:
-            user_rank_info = (idx, score_value)
+    rendered = await render_leaderboard(key, title, window)
+    if rendered is None:
+        await ctx.send("No scores yet for this category!" if window is None else f"No scores {window[2]} for this category!")
+        return
+    msg, footer = rendered
 
     # If user is not in top 15, append their rank
+    user_rank_info = await player_rank(key, str(ctx.author.id), window)
     if user_rank_info and user_rank_info[0] > 15:
         msg += f"\n{user_rank_info[0]}. {ctx.author.display_name}: {user_rank_info[1]}"
 
-    total_rounds = sum(info.get(key, 0) for info in scores.values())
-    msg += f"\nTotal rounds solved: {total_rounds}"
+    msg += footer
 
     await ctx.send(msg)
 
 
 
 @bot.command(name="total", aliases=["totals", "combined", "overall"])
-async def total_leaderboard(ctx):
-    """Show top 15 players by combined letters + numbers + conundrums score."""
-    all_channel_ids = [
-        CONUNDRUM_CHANNEL_ID, TEST_CONUNDRUMS_CHANNEL_ID,
-        NUMBERS_CHANNEL_ID, TEST_NUMBERS_CHANNEL_ID,
-        LETTERS_CHANNEL_ID, TEST_LETTERS_CHANNEL_ID,
-    ]
-    if ctx.channel.id not in all_channel_ids:
+async def total_leaderboard(ctx, *, period: str = None):
+    """
+    Show top 15 players by combined letters + numbers + conundrums score.
+    Usage: !total [today|yesterday|week|lastweek|month|lastmonth]
+    """
+    window = parse_window(period)
+    if window is False:
+        await ctx.send(PERIOD_USAGE.replace("!points", "!total"))
+        return
+
+    if ctx.channel.id not in CHANNEL_HANDLERS:
         await ctx.send("⚠️ This command can only be used in the Conundrum, Numbers, or Letters channels.")
         return
 
@@ -868,44 +1079,65 @@ async def total_leaderboard(ctx):
         await ctx.send("No scores yet!")
         return
 
-    # Build combined totals
-    combined = {
-        uid: (
-            info.get("con_score", 0) + info.get("num_score", 0) + info.get("let_score", 0),
-            info.get("name", "Unknown User"),
-        )
-        for uid, info in scores.items()
-    }
+    rendered = await render_leaderboard(None, "🏆 Combined Leaderboard (Letters + Numbers + Conundrums)", window)
+    if rendered is None:
+        await ctx.send("No scores yet!" if window is None else f"No scores {window[2]}!")
+        return
+    msg, footer = rendered
 
-    # Filter out users with zero total
-    combined = {uid: v for uid, v in combined.items() if v[0] > 0}
+    user_rank_info = await player_rank(None, str(ctx.author.id), window)
+    if user_rank_info and user_rank_info[0] > 15:
+        msg += f"\n{user_rank_info[0]}. {ctx.author.display_name}: {user_rank_info[1]}"
 
-    if not combined:
-        await ctx.send("No scores yet!")
-        return
+    msg += footer
 
-    sorted_scores = sorted(combined.items(), key=lambda x: x[1][0], reverse=True)
+    await ctx.send(msg)
 
-    msg = "**🏆 Combined Leaderboard (Letters + Numbers + Conundrums)**\n"
-    user_id_str = str(ctx.author.id)
-    user_rank_info = None
 
-    for idx, (uid, (total, name)) in enumerate(sorted_scores, 1):
-        if idx <= 15:
-            msg += f"{idx}. {name}: {total}\n"
-        if str(uid) == user_id_str:
-            user_rank_info = (idx, total)
+@bot.command(name="rank", aliases=["myrank"])
+async def rank(ctx):
+    """Show your rank and score in each game and overall."""
+    if ctx.channel.id not in CHANNEL_HANDLERS:
+        await ctx.send("⚠️ This command can only be used in the Conundrum, Numbers, or Letters channels.")
+        return
 
-    if user_rank_info and user_rank_info[0] > 15:
-        msg += f"\n{user_rank_info[0]}. {ctx.author.display_name}: {user_rank_info[1]}"
+    user_id = str(ctx.author.id)
+    lines = [f"**📈 {ctx.author.display_name}'s ranks**"]
+    for key, label in (("con_score", "Conundrum"), ("num_score", "Numbers"), ("let_score", "Letters"), (None, "Combined")):
+        position = await player_rank(key, user_id)
+        if position is None:
+            lines.append(f"{label}: no points yet")
+        else:
+            lines.append(f"{label}: #{position[0]} of {len(rank_indexes[key])} ({position[1]} points)")
+    await ctx.send("\n".join(lines))
 
-    total_rounds = sum(
-        info.get("con_score", 0) + info.get("num_score", 0) + info.get("let_score", 0)
-        for info in scores.values()
-    )
-    msg += f"\nTotal rounds solved: {total_rounds}"
 
-    await ctx.send(msg)
+def format_seconds(seconds):
+    return f"{seconds:.1f}s" if seconds < 60 else f"{int(seconds // 60)}m {seconds % 60:02.0f}s"
+
+@bot.command(name="speed", aliases=["speeds"])
+async def speed(ctx):
+    """Show how fast you solve each game (median, 90th percentile, best) next to everyone's median."""
+    if ctx.channel.id not in CHANNEL_HANDLERS:
+        await ctx.send("⚠️ This command can only be used in the Conundrum, Numbers, or Letters channels.")
+        return
+
+    user_id = str(ctx.author.id)
+    lines = [f"**⏱️ {ctx.author.display_name}'s solve times**"]
+    for game, label in (("conundrum", "Conundrum"), ("numbers", "Numbers"), ("letters", "Letters")):
+        everyone = speed_stats.quantile(game, 0.5)
+        overall = f" (everyone: {format_seconds(everyone)})" if everyone is not None else ""
+        mine = speed_stats.sketch(game, user_id)
+        if mine is None:
+            lines.append(f"{label}: no timed wins yet{overall}")
+            continue
+        median = speed_stats.quantile(game, 0.5, user_id)
+        p90 = speed_stats.quantile(game, 0.9, user_id)
+        lines.append(
+            f"{label}: median {format_seconds(median)}, 90% within {format_seconds(p90)}, "
+            f"best {format_seconds(mine['min'])} over {mine['count']} win{'s' if mine['count'] != 1 else ''}{overall}"
+        )
+    await ctx.send("\n".join(lines))
 
 
 @bot.command(name="dump_scores")
@@ -916,12 +1148,28 @@ async def dump_scores_file(ctx):
         await ctx.send("⚠️ This command can't be used in this channel.")
         return
 
+    await asyncio.to_thread(score_log.compact)  # include any not-yet-saved points
+    if score_db is not None:
+        # The database is the live copy; export it in the usual scores.json format
+        await asyncio.to_thread(atomic_write_json, SCORES_FILE, copy_json_tree(scores), 2)
     try:
-        await ctx.send(file=discord.File("scores.json"))
+        await ctx.send(file=discord.File(SCORES_FILE))
         await ctx.send("✅ Scores file dumped successfully.")
     except FileNotFoundError:
         await ctx.send("⚠️ No scores file found.")
 
+@bot.command(name="status")
+async def status(ctx):
+    """Show FocalTools circuit breaker state, cache statistics and word list memory use."""
+    lines = ["**📊 Bot status**"]
+    lines += focaltools.stats_lines()
+    lines.append(f"Persistent store: {await response_store.count()} responses in {RESPONSE_STORE_FILE}")
+    lines += word_memory_lines()
+    lines += guess_memo_lines()
+    lines += [actor.status_line() for actor in channel_actors.values()]
+    lines.append(timers.status_line())
+    await ctx.send("\n".join(lines))
+
 # === Numbers Game (numbers-bot channel only) ===
 async def new_numbers_round(channel):
     """Generate and post a random solvable numbers puzzle with emoji formatting."""
@@ -968,7 +1216,9 @@ async def new_numbers_round(channel):
                 "selection": selection,
                 "target": target,
                 "solution": solutions["results"][0][1],
+                "started": start_round(channel.id),
             }
+            save_rounds()
 
             selection_emojis = " ".join(encode_number_selection(n) for n in selection)
             target_emojis = encode_target_digits(target)
@@ -1040,29 +1290,58 @@ def draw_letters():
     random.shuffle(selection)
     return selection
 
+# Reaction for each way a non-winning letters guess can be classified
+LETTERS_REACTIONS = {
+    "valid": "⬆️",       # a real word, but shorter than the maxes
+    "invalid": "❌",     # formable from the selection but not a word
+    "removed": "🪦",     # used to be a word
+    "unformable": "❓",  # needs letters the selection doesn't have
+}
+
+def build_letters_verdicts(selection, maxes):
+    """Map every word that can be made from the selection to "max" or "valid"."""
+    verdicts = {}
+    for length in range(1, len(selection) + 1):
+        for word in history.formable(selection, length):
+            verdicts[word] = "valid"
+    for word in maxes:
+        verdicts[word] = "max"
+    return verdicts
+
+def classify_letters_guess(round_data, guess):
+    """Classify a guess against the round's precomputed state, without any remote lookup."""
+    verdict = round_data["verdicts"].get(guess)
+    if verdict:
+        return verdict
+    if Counter(guess) - round_data["counts"]:
+        return "unformable"
+    if guess in history.invalid:
+        return "removed"
+    return "invalid"
+
 async def new_letters_round(channel, max_retries=3):
     """Generate and post a random letters puzzle asynchronously."""
     for attempt in range(1, max_retries + 1):
         selection = draw_letters()
         selection_str = "".join(selection)
-        user_identifier = urllib.parse.quote("lettersbot")
-        url = f"https://focaltools.azurewebsites.net/api/getmaxes/{selection_str}?ip={user_identifier}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    response.raise_for_status()
-                    text = await response.text()
-                    words = json.loads(text)
+            words = await fetch_maxes(selection_str, ip="lettersbot")
 
             if not words:
                 await channel.send(f"⚠️ No valid words found for `{selection_str}` (attempt {attempt}/{max_retries})")
                 continue  # try again
 
+            # Precompute every answer once so guesses never need a remote lookup
+            verdicts = await asyncio.to_thread(build_letters_verdicts, selection_str, words)
             current_letters[channel.id] = {
                 "selection": selection_str,
-                "maxes": [w.upper() for w in words],
+                "maxes": words,
+                "counts": Counter(selection_str),
+                "verdicts": verdicts,
+                "started": start_round(channel.id),
             }
+            save_rounds()
 
             emoji_output = encode_letters(selection_str)
             await channel.send(f"Find the longest word from this letters selection:\n>{emoji_output}<")
@@ -1077,395 +1356,505 @@ async def new_letters_round(channel, max_retries=3):
         except Exception as e:
             await channel.send(f"❌ Unexpected error fetching maxes: `{e}` (attempt {attempt}/{max_retries})")
 
-        await asyncio.sleep(2)  # small delay before retry
+        if focaltools.available:
+            await asyncio.sleep(2)  # small delay before retry; skipped once we've gone local
 
     await channel.send("❌ Could not generate a valid letters round after several attempts.")
-    
-@bot.event
-async def on_message(message):
-    if message.author.bot:
+
+# === Message handling per game ===
+def evaluate_numbers_guess(guess, selection):
+    """(normalized expression, its value or False if invalid) for a numbers guess."""
+    # 🟡 "Add" shorthand — e.g. "add them up"
+    if guess.lower().startswith("add"):
+        guess = "+".join(str(n) for n in selection)
+
+    # 🟡 "Multiply"/"Times" shorthand — e.g. "multiply them" or "times them together"
+    elif guess.lower().startswith(("multiply", "times")):
+        guess = "x".join(str(n) for n in selection)
+
+    # Otherwise, replace shorthand letters everywhere
+    else:
+        shorthand_map = {"h": "100", "s": "75", "f": "50", "t": "25"}
+        for key, val in shorthand_map.items():
+            guess = re.sub(key, val, guess, flags=re.IGNORECASE)
+
+    # ✅ Normalize before evaluation and for display
+    normalized_guess = normalize_expression(guess)
+    return normalized_guess, parse_numbers_solution(normalized_guess, selection)
+
+def numbers_display(cid):
+    """The numbers round's selection and target, as posted by "print"."""
+    sel = current_numbers[cid]["selection"]
+    tgt = current_numbers[cid]["target"]
+    selection_emojis = " ".join(encode_number_selection(n) for n in sel)
+    target_emojis = " ".join(NUMBER_EMOJI_MAP[d] for d in str(tgt))
+    return (
+        f":dart:--->{target_emojis}<---:dart:\n"
+        f"|-{selection_emojis}-|"
+    )
+
+def give_up_numbers(cid, expired=False):
+    """End the numbers round unsolved; returns the message revealing a solution."""
+    sol = current_numbers[cid]["solution"]
+    sel = current_numbers[cid]["selection"]
+    tgt = current_numbers[cid]["target"]
+    del current_numbers[cid]
+    end_round(cid)
+    selection_param = "-".join(str(n) for n in sel)
+    url = f"https://greem.co.uk/quantumtombola/?sel={urllib.parse.quote(selection_param)}&target={urllib.parse.quote(str(tgt))}"
+    return f"💡 A possible solution is: `{sol}`\nSee all solutions in Quantum Tombola:\n<{url}>"
+
+def conundrum_display(cid):
+    """The conundrum's current scramble, as posted by "print"."""
+    return f">{encode_letters(current_conundrum_display.get(cid, scramble(current[cid])))}<"
+
+def give_up_conundrum(cid, expired=False):
+    """
+    End the conundrum unsolved; returns the message revealing the answer.
+    A round that timed out with nobody playing is logged as "expired", not as a give-up.
+    """
+    answer = current.pop(cid)
+    end_round(cid)
+    current_conundrum_display.pop(cid, None)
+    finish_conundrum(cid, answer, "expired" if expired else "gaveup")
+    return f"💡 The answer is **{answer}**."
+
+def letters_display(cid):
+    """The letters round's selection, as posted by "print"."""
+    return f">{encode_letters(current_letters[cid]['selection'])}<"
+
+def give_up_letters(cid, expired=False):
+    """End the letters round unsolved; returns the message revealing the maxes."""
+    formatted = ", ".join(f"**{w}**" for w in sorted(current_letters[cid]["maxes"]))
+    del current_letters[cid]
+    end_round(cid)
+    return f"💡 Max words were: {formatted}"
+
+async def handle_numbers_message(message):
+    """A guess, give-up or "print" in a numbers channel."""
+    cid = message.channel.id
+    if cid not in current_numbers:
         return
+    guess = message.content.strip()
 
-    # --- NUMBERS CHANNELS (main + test) ---
-    if message.channel.id in [NUMBERS_CHANNEL_ID, TEST_NUMBERS_CHANNEL_ID]:
-        cid = message.channel.id
-        if cid in current_numbers and not message.content.startswith("!"):
-            guess = message.content.strip()
-
-            # User gives up
-            if guess.lower() in ["give up", "giveup", "skip", "next"]:
-                sol = current_numbers[cid]["solution"]
-                sel = current_numbers[cid]["selection"]
-                tgt = current_numbers[cid]["target"]
-                selection_param = "-".join(str(n) for n in sel)
-                url = f"https://greem.co.uk/quantumtombola/?sel={urllib.parse.quote(selection_param)}&target={urllib.parse.quote(str(tgt))}"
-                await message.channel.send(
-                    f"💡 A possible solution is: `{sol}`\nSee all solutions in Quantum Tombola:\n<{url}>"
-                )
-                await new_numbers_round(message.channel)
-                return
+    # User gives up
+    if guess.lower() in ["give up", "giveup", "skip", "next"]:
+        await message.channel.send(give_up_numbers(cid))
+        await new_numbers_round(message.channel)
+        return
 
-            # print current puzzle
-            if guess.lower() == "print":
-                sel = current_numbers[cid]["selection"]
-                tgt = current_numbers[cid]["target"]
-                selection_emojis = " ".join(encode_number_selection(n) for n in sel)
-                target_emojis = " ".join(NUMBER_EMOJI_MAP[d] for d in str(tgt))
-                await message.channel.send(
-                    f":dart:--->{target_emojis}<---:dart:\n"
-                    f"|-{selection_emojis}-|"
-                )
-                return
+    # print current puzzle
+    if guess.lower() == "print":
+        await message.channel.send(numbers_display(cid))
+        return
 
-            selection = current_numbers[cid]["selection"]
-            target = current_numbers[cid]["target"]
+    selection = current_numbers[cid]["selection"]
+    target = current_numbers[cid]["target"]
 
-            # 🟡 "Add" shorthand — e.g. "add them up"
-            if guess.lower().startswith("add"):
-                guess = "+".join(str(n) for n in selection)
+    # Case and spacing don't change how an expression is read, so they share a memo entry
+    normalized_guess, result = remembered_verdict(
+        cid, "numbers", "".join(guess.lower().split()), lambda: evaluate_numbers_guess(guess, selection)
+    )
+    if result is False:
+        return  # ignore invalid attempts
+    if result != target:
+        return
 
-            # 🟡 "Multiply"/"Times" shorthand — e.g. "multiply them" or "times them together"
-            elif guess.lower().startswith(("multiply", "times")):
-                guess = "x".join(str(n) for n in selection)
+    # Correct. The channel's actor handles one message at a time, so this is the only winner.
+    winner_id = str(message.author.id)
+    winner_name = message.author.display_name
 
-            # Otherwise, replace shorthand letters everywhere
-            else:
-                shorthand_map = {"h": "100", "s": "75", "f": "50", "t": "25"}
-                for key, val in shorthand_map.items():
-                    guess = re.sub(key, val, guess, flags=re.IGNORECASE)
-
-            # ✅ Normalize before evaluation and for display
-            normalized_guess = normalize_expression(guess)
-            # Evaluate the user’s attempt
-            result = parse_numbers_solution(normalized_guess, selection)
-            if result is False:
-                return  # ignore invalid attempts
-
-            # Ensure per-channel lock exists
-            numbers_locks.setdefault(cid, asyncio.Lock())
-
-
-            # Capture data for use outside the lock
-
-            is_correct = False
-            winner_name = None
-            winner_id = None
-            chosen_congrats = None
-            chosen_guess = None
-
-            async with numbers_locks[cid]:
-                if cid not in current_numbers:
-                    return  # already solved
-
-                if result == target:
-
-                    is_correct = True
-                    winner_id = str(message.author.id)
-                    winner_name = message.author.display_name
-
-                    existing_data = scores.get(winner_id, {})
-                    con_score = existing_data.get("con_score", 0)
-                    num_score = existing_data.get("num_score", 0)
-                    let_score = existing_data.get("let_score", 0)
-
-                    # 🧮 Check for "no large numbers used" condition
-                    large_numbers = {25, 50, 75, 100}
-                    selection_has_large = any(n in large_numbers for n in selection)
-
-                    # Normalize expression before checking which numbers were used
-                    used_large = any(str(n) in normalized_guess for n in large_numbers)
-
-                    # 🐱 LNAFP bonus if selection had large numbers but user didn’t use any
-                    cat_bonus = selection_has_large and not used_large
-
-                    if cat_bonus:
-                        num_score += 2
-                        await safe_react(message, "<:LNAFP:1437476304990638162>")
-                        await message.channel.send("<:LNAFP:1437476304990638162> Double points!")
-                    else:
-                        num_score += 1
-
-                    # Save updated score
-                    scores[winner_id] = {
-                        "name": winner_name,
-                        "con_score": con_score,
-                        "num_score": num_score,
-                        "let_score": let_score,
-                    }
+    # 🧮 Check for "no large numbers used" condition
+    large_numbers = {25, 50, 75, 100}
+    selection_has_large = any(n in large_numbers for n in selection)
 
-                    chosen_congrats = random.choice(CONGRATS_MESSAGES).format(user=winner_name)
-                    chosen_guess = normalized_guess  # display normalized version
-                    del current_numbers[cid]
+    # Normalize expression before checking which numbers were used
+    used_large = any(str(n) in normalized_guess for n in large_numbers)
 
-            # Outside the lock: save file, announce winner, start new round
-            if is_correct:
-                with open(SCORES_FILE, "w", encoding="utf-8") as f:
-                    json.dump(scores, f, indent=2)
+    # 🐱 LNAFP bonus if selection had large numbers but user didn’t use any
+    cat_bonus = selection_has_large and not used_large
 
-                await message.channel.send(f"{chosen_congrats}\n> `{chosen_guess}` = **{target}**")
-                await new_numbers_round(message.channel)
-                return
+    if cat_bonus:
+        award_points(winner_id, winner_name, "numbers", 2, bonus="lnafp", channel_id=cid)
+    else:
+        award_points(winner_id, winner_name, "numbers", 1, channel_id=cid)
+    del current_numbers[cid]
+    end_round(cid)
+
+    if cat_bonus:
+        await safe_react(message, "<:LNAFP:1437476304990638162>")
+        await message.channel.send("<:LNAFP:1437476304990638162> Double points!")
+
+    # Announce winner (normalized expression), start new round
+    chosen_congrats = random.choice(CONGRATS_MESSAGES).format(user=winner_name)
+    await message.channel.send(f"{chosen_congrats}\n> `{normalized_guess}` = **{target}**")
+    await new_numbers_round(message.channel)
+
+async def handle_conundrum_message(message):
+    """A guess, give-up, hint, shuffle or "print" in a conundrum channel."""
+    cid = message.channel.id
+    if cid not in current:
+        return
+    guess = message.content.strip().replace("?", "").lower()
 
-    # --- CONUNDRUM CHANNELS (main + test) ---
-    elif message.channel.id in [CONUNDRUM_CHANNEL_ID, TEST_CONUNDRUMS_CHANNEL_ID]:
-        cid = message.channel.id
-        if cid in current and not message.content.startswith("!"):
-            guess = message.content.strip().replace("?", "").lower()
-    
-            if guess.lower() == "hint":
-                answer = current[cid]
-                scrambled_view = encode_letters(current_conundrum_display.get(cid, scramble(answer)))
-            
-                first, last = answer[0], answer[-1]
-                middle_len = len(answer) - 2
-                blanks = " ".join("⏹️" for _ in range(middle_len))
-            
-                hint_display = f"{encode_letters(first)} {blanks} {encode_letters(last)}"
-            
-                await message.channel.send(f"💡 Here's a hint:\n>{scrambled_view}<\n>{hint_display}<")
-                return
+    if guess.lower() == "hint":
+        answer = current[cid]
+        scrambled_view = encode_letters(current_conundrum_display.get(cid, scramble(answer)))
 
-            # shuffle conundrum letters
-            if guess.lower() in ["shuffle", "swap"]:
-                answer = current[cid]
-                new_scramble = scramble(answer)
-                current_conundrum_display[cid] = new_scramble
-                scrambled_view = encode_letters(new_scramble)
-                await message.channel.send(f">{scrambled_view}<")
-                return
+        first, last = answer[0], answer[-1]
+        middle_len = len(answer) - 2
+        blanks = " ".join("⏹️" for _ in range(middle_len))
 
-            # print current puzzle
-            if guess.lower() == "print":
-                scrambled_view = encode_letters(current_conundrum_display.get(cid, scramble(current[cid])))
-                await message.channel.send(f">{scrambled_view}<")
-                return
-    
-            # 🧩 Handle "give up" or similar
-            if guess in ["give up", "giveup", "skip", "next"]:
-                answer = current[cid]
-                current_conundrum_display.pop(cid, None)
-                await message.channel.send(f"💡 The answer is **{answer}**.")
-                await new_puzzle(message.channel)
-                return
-    
-            # ensure lock exists
-            locks.setdefault(cid, asyncio.Lock())
-    
-            # captureables for after-lock actions
-            is_correct = False
-            winner_id = None
-            winner_name = None
-            chosen_congrats = None
-            answer_text = None
-    
-            async with locks[cid]:
-                if cid not in current:
-                    return  # already solved
-    
-                if guess == current[cid].lower():
-                    is_correct = True
-                    winner_id = str(message.author.id)
-                    winner_name = message.author.display_name
-    
-                    existing_data = scores.get(winner_id, {})
-                    con_score = existing_data.get("con_score", 0) + 1
-                    num_score = existing_data.get("num_score", 0)
-                    let_score = existing_data.get("let_score", 0)
-    
-                    scores[winner_id] = {
-                        "name": winner_name,
-                        "con_score": con_score,
-                        "num_score": num_score,
-                        "let_score": let_score,
-                    }
-    
-                    chosen_congrats = random.choice(CONGRATS_MESSAGES).format(user=winner_name)
-                    answer_text = current[cid]
-                    del current[cid]
-                    current_conundrum_display.pop(cid, None)
-    
-            # outside lock: persist + notify + new puzzle
-            if is_correct:
-                with open(SCORES_FILE, "w", encoding="utf-8") as f:
-                    json.dump(scores, f, indent=2)
-    
-                try:
-                    await message.channel.send(f"{chosen_congrats} The answer is **{answer_text}**")
-                except discord.errors.DiscordServerError:
-                    pass  # best-effort; always start the next puzzle
-                await new_puzzle(message.channel)
-                return
+        hint_display = f"{encode_letters(first)} {blanks} {encode_letters(last)}"
 
-    # --- LETTERS CHANNELS (main + test) ---
-    elif message.channel.id in [LETTERS_CHANNEL_ID, TEST_LETTERS_CHANNEL_ID]:
-        cid = message.channel.id
-    
-        # Do not consume commands
-        if message.content.startswith("!"):
-            await bot.process_commands(message)
-            return
-    
-        # If no active round, ignore but still allow commands in channel
-        if cid not in current_letters:
-            await bot.process_commands(message)
-            return
-    
-        letters_locks.setdefault(cid, asyncio.Lock())
-    
-        async with letters_locks[cid]:
-    
-            # Round may have ended while waiting for lock
-            if cid not in current_letters:
-                await bot.process_commands(message)
-                return
-    
-            round_data = current_letters[cid]
-            selection = round_data["selection"]
-            maxes = round_data["maxes"]
-    
-            guess = message.content.strip().upper()
-
-            # correct — check before keywords so e.g. HINT/PRINT/SKIP can be valid answers
-            if guess in maxes:
-                winner_id = str(message.author.id)
-                winner_name = message.author.display_name
-                existing = scores.get(winner_id, {})
-                scores[winner_id] = {
-                    "name": winner_name,
-                    "con_score": existing.get("con_score", 0),
-                    "num_score": existing.get("num_score", 0),
-                    "let_score": existing.get("let_score", 0) + 1,
-                }
-                congrats = random.choice(CONGRATS_MESSAGES).format(user=winner_name)
-                formatted = ", ".join(f"**{w}**" for w in sorted(maxes))
-                del current_letters[cid]
-                post_action = ("correct", (congrats, formatted, guess))
-
-            # give up
-            elif guess.lower() in ["give up", "giveup", "skip", "next"]:
-                formatted = ", ".join(f"**{w}**" for w in sorted(maxes))
-                del current_letters[cid]
-                post_action = ("giveup", formatted)
-    
-            # hint
-            elif guess.lower() == "hint":
-                if not maxes:
-                    post_action = ("nomaxes", None)
-                else:
-                    word = random.choice(maxes)
-                    first, last = word[0], word[-1]
-                    blanks = " ".join("⏹️" for _ in range(len(word) - 2))
-                    sel_display = encode_letters(selection)
-                    hint_display = f"{encode_letters(first)} {blanks} {encode_letters(last)}"
-                    post_action = ("hint", (sel_display, hint_display))
-
-            # shuffle
-            elif guess.lower() in ["shuffle", "swap"]:
-                # Convert string to list, shuffle, and join back
-                s_list = list(selection)
-                random.shuffle(s_list)
-                new_selection = "".join(s_list)
-                
-                # Update the state so the shuffle persists for future prints
-                current_letters[cid]["selection"] = new_selection
-                
-                # Reuse the print format
-                sel_display = encode_letters(new_selection)
-                post_action = ("print", sel_display)
-
-            # print current puzzle
-            elif guess.lower() == "print":
-                sel_display = encode_letters(selection)
-                post_action = ("print", sel_display)
-    
-            # incorrect
-            else:
-                if " " in guess:
-                    post_action = ("ignore", None)
-                elif not all(guess.count(ch) <= selection.count(ch) for ch in guess):
-                    post_action = ("react", "❓")
-                elif guess in history_invalid:
-                    post_action = ("react", "🪦")
-                else:
-                    post_action = ("checkword", guess)
-    
-        # ----- post-lock actions -----
-        action, data = post_action
-    
-        if action == "giveup":
-            await message.channel.send(f"💡 Max words were: {data}")
-            await new_letters_round(message.channel)
-            await bot.process_commands(message)
-            return
-    
-        if action == "nomaxes":
-            await message.channel.send("⚠️ No max words available yet.")
-            await bot.process_commands(message)
-            return
-    
-        if action == "hint":
-            sel_display, hint_display = data
-            try:
-                await message.channel.send(f"💡 Here's a hint:\n>{sel_display}<\n>{hint_display}<")
-            except discord.errors.DiscordServerError:
-                pass
-            await bot.process_commands(message)
-            return
+        await message.channel.send(f"💡 Here's a hint:\n>{scrambled_view}<\n>{hint_display}<")
+        return
 
-        if action == "shuffle":
-            await message.channel.send(f">{data}<")
-            await bot.process_commands(message)
-            return
+    # shuffle conundrum letters
+    if guess.lower() in ["shuffle", "swap"]:
+        answer = current[cid]
+        new_scramble = scramble(answer)
+        current_conundrum_display[cid] = new_scramble
+        save_rounds()
+        scrambled_view = encode_letters(new_scramble)
+        await message.channel.send(f">{scrambled_view}<")
+        return
 
-        if action == "print":
-            await message.channel.send(f">{data}<")
-            await bot.process_commands(message)
-            return
-    
-        if action == "correct":
-            congrats, formatted, winning_word = data
-            await safe_react(message, "✅")
-            nine_letter_bonus = "  :nine:-letter word! " if len(winning_word) == 9 else ""
-            with open(SCORES_FILE, "w", encoding="utf-8") as f:
-                json.dump(scores, f, indent=2)
-            try:
-                await message.channel.send(f"{congrats}{nine_letter_bonus} 💡 The maxes were: {formatted}")
-            except discord.errors.DiscordServerError:
-                pass  # best-effort; always start the next round
-            await new_letters_round(message.channel)
-            await bot.process_commands(message)
-            return
-    
-        if action == "ignore":
-            await bot.process_commands(message)
-            return
-    
-        if action == "react":
-            await safe_react(message, data)
-            await bot.process_commands(message)
-            return
-    
-        if action == "checkword":
-            guess = data
-            user_identifier = urllib.parse.quote("lettersbot")
-            url = f"https://focaltools.azurewebsites.net/api/checkword/{guess}?ip={user_identifier}"
+    # print current puzzle
+    if guess.lower() == "print":
+        await message.channel.send(conundrum_display(cid))
+        return
+
+    # 🧩 Handle "give up" or similar
+    if guess in ["give up", "giveup", "skip", "next"]:
+        await message.channel.send(give_up_conundrum(cid))
+        await new_puzzle(message.channel)
+        return
+
+    # Any valid anagram of the answer counts, not just the word we picked
+    answer = current[cid]
+    if not remembered_verdict(cid, "conundrum", guess, lambda: word_lists.is_conundrum_answer(guess, answer)):
+        return
+
+    # Correct. The channel's actor handles one message at a time, so this is the only winner.
+    winner_id = str(message.author.id)
+    winner_name = message.author.display_name
+    award_points(winner_id, winner_name, "conundrum", 1, channel_id=cid)
+
+    chosen_congrats = random.choice(CONGRATS_MESSAGES).format(user=winner_name)
+    answer_text = current[cid]
+    alternative = guess != answer_text.lower()
+    del current[cid]
+    end_round(cid)
+    current_conundrum_display.pop(cid, None)
+    finish_conundrum(cid, answer_text, "solved")
+
+    # notify + new puzzle
+    if alternative:
+        reply = f"{chosen_congrats} **{guess.upper()}** is another valid answer; I was thinking of **{answer_text}**"
+    else:
+        reply = f"{chosen_congrats} The answer is **{answer_text}**"
+    try:
+        await message.channel.send(reply)
+    except discord.errors.DiscordServerError:
+        pass  # best-effort; always start the next puzzle
+    await new_puzzle(message.channel)
+
+async def handle_letters_message(message):
+    """A guess, give-up, hint, shuffle or "print" in a letters channel."""
+    cid = message.channel.id
+    if cid not in current_letters:
+        return
+
+    round_data = current_letters[cid]
+    selection = round_data["selection"]
+    maxes = round_data["maxes"]
+
+    guess = message.content.strip().upper()
+
+    # correct — check before keywords so e.g. HINT/PRINT/SKIP can be valid answers
+    if round_data["verdicts"].get(guess) == "max":
+        winner_id = str(message.author.id)
+        winner_name = message.author.display_name
+        bonus = "nine_letter" if len(guess) == 9 else None
+        award_points(winner_id, winner_name, "letters", 1, bonus=bonus, channel_id=cid)
+        congrats = random.choice(CONGRATS_MESSAGES).format(user=winner_name)
+        formatted = ", ".join(f"**{w}**" for w in sorted(maxes))
+        del current_letters[cid]
+        end_round(cid)
+        post_action = ("correct", (congrats, formatted, guess))
+
+    # give up
+    elif guess.lower() in ["give up", "giveup", "skip", "next"]:
+        post_action = ("giveup", give_up_letters(cid))
+
+    # hint
+    elif guess.lower() == "hint":
+        if not maxes:
+            post_action = ("nomaxes", None)
+        else:
+            word = random.choice(maxes)
+            first, last = word[0], word[-1]
+            blanks = " ".join("⏹️" for _ in range(len(word) - 2))
+            sel_display = encode_letters(selection)
+            hint_display = f"{encode_letters(first)} {blanks} {encode_letters(last)}"
+            post_action = ("hint", (sel_display, hint_display))
+
+    # shuffle
+    elif guess.lower() in ["shuffle", "swap"]:
+        # Convert string to list, shuffle, and join back
+        s_list = list(selection)
+        random.shuffle(s_list)
+        new_selection = "".join(s_list)
+
+        # Update the state so the shuffle persists for future prints
+        current_letters[cid]["selection"] = new_selection
+        save_rounds()
+
+        # Reuse the print format
+        post_action = ("print", letters_display(cid))
+
+    # print current puzzle
+    elif guess.lower() == "print":
+        post_action = ("print", letters_display(cid))
+
+    # incorrect
+    else:
+        if " " in guess:
+            post_action = ("ignore", None)
+        else:
+            verdict = remembered_verdict(cid, "letters", guess, lambda: classify_letters_guess(round_data, guess))
+            post_action = ("react", LETTERS_REACTIONS[verdict])
+
+    # ----- actions -----
+    action, data = post_action
+
+    if action == "giveup":
+        await message.channel.send(data)
+        await new_letters_round(message.channel)
+        return
+
+    if action == "nomaxes":
+        await message.channel.send("⚠️ No max words available yet.")
+        return
+
+    if action == "hint":
+        sel_display, hint_display = data
+        try:
+            await message.channel.send(f"💡 Here's a hint:\n>{sel_display}<\n>{hint_display}<")
+        except discord.errors.DiscordServerError:
+            pass
+        return
+
+    if action == "shuffle":
+        await message.channel.send(f">{data}<")
+        return
+
+    if action == "print":
+        await message.channel.send(data)
+        return
+
+    if action == "correct":
+        congrats, formatted, winning_word = data
+        await safe_react(message, "✅")
+        nine_letter_bonus = "  :nine:-letter word! " if len(winning_word) == 9 else ""
+        try:
+            await message.channel.send(f"{congrats}{nine_letter_bonus} 💡 The maxes were: {formatted}")
+        except discord.errors.DiscordServerError:
+            pass  # best-effort; always start the next round
+        await new_letters_round(message.channel)
+        return
+
+    if action == "ignore":
+        return
+
+    if action == "react":
+        await safe_react(message, data)
+
+class GameHandler:
+    """
+    What a game does with messages in its channels, how it starts, shows and
+    gives up a round, and its leaderboard.
+    """
+
+    def __init__(self, game, handle_message, new_round, display, give_up, score_key, title):
+        self.game = game
+        self.handle_message = handle_message
+        self.new_round = new_round
+        self.display = display    # cid -> the puzzle as "print" shows it
+        self.give_up = give_up    # (cid, expired=False) -> ends the round, returns the reveal message
+        self.score_key = score_key
+        self.title = title
+
+GAME_HANDLERS = {
+    "conundrum": GameHandler(
+        "conundrum", handle_conundrum_message, new_puzzle, conundrum_display, give_up_conundrum,
+        "con_score", "🏆 Conundrum Leaderboard",
+    ),
+    "numbers": GameHandler(
+        "numbers", handle_numbers_message, new_numbers_round, numbers_display, give_up_numbers,
+        "num_score", "🔢 Numbers Leaderboard",
+    ),
+    "letters": GameHandler(
+        "letters", handle_letters_message, new_letters_round, letters_display, give_up_letters,
+        "let_score", "🔤 Countdown Letters Leaderboard",
+    ),
+}
+
+# Channel id -> handler, from config.GAME_CHANNELS
+CHANNEL_HANDLERS = {cid: GAME_HANDLERS[game] for cid, game in GAME_CHANNELS.items()}
+
+def channel_actor(cid, handler):
+    actor = channel_actors.get(cid)
+    if actor is None:
+        actor = channel_actors[cid] = ChannelActor(
+            f"{handler.game} {cid}", handler.handle_message, lambda: round_ids.get(cid)
+        )
+    return actor
+
+# === Warm restart ===
+def save_rounds():
+    """Snapshot the rounds in progress; called whenever one starts, ends or is reshuffled."""
+    round_store.save({
+        "conundrum": {
+            str(cid): {
+                "word": word,
+                "display": current_conundrum_display.get(cid),
+                "round": round_ids.get(cid),
+            }
+            for cid, word in current.items()
+        },
+        "numbers": {
+            str(cid): {
+                "selection": r["selection"],
+                "target": r["target"],
+                "solution": r["solution"],
+                "round": round_ids.get(cid),
+            }
+            for cid, r in current_numbers.items()
+        },
+        "letters": {
+            str(cid): {
+                "selection": r["selection"],
+                "maxes": r["maxes"],
+                "round": round_ids.get(cid),
+            }
+            for cid, r in current_letters.items()
+        },
+        "idle": sorted(idle_channels),
+        "difficulty": {str(cid): tier for cid, tier in conundrum_difficulty.items()},
+    })
+
+async def restore_rounds():
+    """
+    Resume the rounds that were running when the bot last stopped. Letters
+    verdicts are rebuilt locally from the saved maxes; nothing is refetched.
+    Resumed rounds are untimed: the clock would include the downtime, which
+    would skew the solve-speed stats and conundrum tiers.
+    """
+    saved = round_store.load()
+
+    restored = 0
+    for key, tier in saved.get("difficulty", {}).items():
+        if GAME_CHANNELS.get(int(key)) == "conundrum" and tier in TIERS:
+            conundrum_difficulty.setdefault(int(key), tier)
+
+    for game, rounds in saved.items():
+        if game not in GAME_HANDLERS:
+            continue
+        for key, r in rounds.items():
+            cid = int(key)
+            if GAME_CHANNELS.get(cid) != game or round_in_progress(cid):
+                continue  # channel no longer plays this game, or a round already started
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url, timeout=10) as resp:
-                        result = (await resp.text()).strip().lower()
-            except Exception:
-                result = "error"
-    
-            if "true" in result:
-                await safe_react(message, "⬆️")
-            elif "false" in result:
-                await safe_react(message, "❌")
-            else:
-                await safe_react(message, "⚠️")
-    
-            await bot.process_commands(message)
-            return
+                if game == "conundrum":
+                    current[cid] = r["word"]
+                    current_conundrum_display[cid] = r["display"] or scramble(r["word"])
+                    conundrum_started[cid] = None
+                elif game == "numbers":
+                    current_numbers[cid] = {
+                        "selection": r["selection"],
+                        "target": r["target"],
+                        "solution": r["solution"],
+                        "started": None,
+                    }
+                else:
+                    verdicts = await asyncio.to_thread(build_letters_verdicts, r["selection"], r["maxes"])
+                    current_letters[cid] = {
+                        "selection": r["selection"],
+                        "maxes": r["maxes"],
+                        "counts": Counter(r["selection"]),
+                        "verdicts": verdicts,
+                        "started": None,
+                    }
+            except (KeyError, TypeError) as e:
+                print(f"⚠️ Skipping saved {game} round for channel {cid}: {e!r}")
+                continue
+            round_ids[cid] = r.get("round") or f"{cid}-{time.time_ns() // 1_000_000}"
+            guess_memos[cid] = {}
+            arm_round_timers(cid)
+            restored += 1
+    for cid in saved.get("idle", []):
+        if cid in CHANNEL_HANDLERS and not round_in_progress(cid):
+            idle_channels.add(cid)
+    save_rounds()
+    print(f"♻️ Resumed {restored} rounds from {ROUND_STATE_FILE}.")
+
+# === Round timers ===
+def round_in_progress(cid):
+    return cid in current or cid in current_numbers or cid in current_letters
+
+def arm_round_timers(cid):
+    """(Re)start the channel's reminder and idle timeout; called when a round starts and on each message."""
+    round_id = round_ids.get(cid)
+    timers.schedule(("reminder", cid), ROUND_REMINDER_SECONDS, lambda: round_timer_fired(cid, round_id, remind_round))
+    timers.schedule(("idle", cid), ROUND_IDLE_SECONDS, lambda: round_timer_fired(cid, round_id, expire_round))
+
+async def round_timer_fired(cid, round_id, job):
+    """Queue a round timer's job on the channel's actor, to run only if that round is still on."""
+    handler = CHANNEL_HANDLERS.get(cid)
+    channel = bot.get_channel(cid)
+    if handler is None or channel is None:
+        return
+
+    async def run():
+        if round_ids.get(cid) == round_id and round_in_progress(cid):
+            await job(handler, channel)
+
+    channel_actor(cid, handler).submit_call(run)
 
+async def remind_round(handler, channel):
+    await channel.send(f"⏰ Still unsolved:\n{handler.display(channel.id)}")
+
+async def expire_round(handler, channel):
+    """End a round nobody is playing; the channel's next message starts a new one."""
+    reveal = handler.give_up(channel.id, expired=True)
+    idle_channels.add(channel.id)
+    save_rounds()
+    await channel.send(
+        f"💤 Nothing posted for {ROUND_IDLE_SECONDS // 60} minutes, so this round is over.\n"
+        f"{reveal}\nSend any message here to start a new round."
+    )
+
+@bot.event
+async def on_message(message):
+    if message.author.bot:
+        return
+
+    # One dict lookup; messages outside the quiz channels go straight to commands
+    handler = CHANNEL_HANDLERS.get(message.channel.id)
+    if handler is not None and not message.content.startswith("!"):
+        cid = message.channel.id
+        # Queued for the channel's actor, which handles its messages one at a time
+        actor = channel_actor(cid, handler)
+        if cid in idle_channels:
+            # The last round timed out; any message brings the game back
+            idle_channels.discard(cid)
+            actor.submit_call(lambda: handler.new_round(message.channel))
+        else:
+            if round_in_progress(cid):
+                arm_round_timers(cid)
+            actor.submit(message)
 
     # Always allow commands to process
     await bot.process_commands(message)
@@ -1487,31 +1876,79 @@ async def dump_scores_daily():
     else:
         await channel.send("⚠️ `!dump_scores` command not found.")
 
+@tasks.loop(seconds=30)
+async def watch_word_files():
+    """Hot-reload the word lists when conundrums.txt or the history files change."""
+    if not word_reload_lock.locked() and word_files_changed(word_lists):
+        try:
+            await reload_word_lists()
+        except Exception as e:
+            print(f"⚠️ Word list reload failed; keeping the current lists: {e}")
+
+@tasks.loop(hours=6)
+async def refresh_conundrum_meta():
+    """Rebuild the conundrum difficulty tiers with the solve history recorded so far."""
+    global conundrum_meta
+    try:
+        rows = await asyncio.to_thread(rebuild_conundrum_meta, word_lists)
+        new_meta = await asyncio.to_thread(load_conundrum_meta)
+    except Exception as e:
+        print(f"⚠️ Could not refresh conundrum difficulty; keeping the current tiers: {e}")
+        return
+    if new_meta is not None:
+        conundrum_meta = new_meta
+        rated = sum(1 for row in rows if row["rounds"] >= MIN_ROUNDS)
+        print(f"🎚️ Refreshed conundrum difficulty for {len(rows)} conundrums ({rated} rated from solve history)")
+
+@bot.command(name="reload_words")
+@commands.has_permissions(manage_messages=True)
+async def reload_words(ctx):
+    """Rebuild the word lists from disk without restarting (only usable from #test_general)."""
+    if ctx.channel.id != TEST_GENERAL_CHANNEL_ID:
+        await ctx.send("⚠️ This command can't be used in this channel.")
+        return
+
+    try:
+        await reload_word_lists()
+    except Exception as e:
+        await ctx.send(f"❌ Reload failed; keeping the current word lists: `{e}`")
+        return
+    await ctx.send(f"✅ Reloaded {len(WORDS)} conundrums and {len(history.valid)} valid / {len(history.invalid)} invalid history words.")
+
 @bot.event
 async def on_ready():
+    global rounds_restored
     print(f"✅ Logged in as {bot.user} (id: {bot.user.id})")
 
-    # --- Load invalid history once on startup ---
-    global history_invalid
-    history_invalid = set()
-    try:
-        with open("history_invalid.txt", "r", encoding="utf-8") as f:
-            for line in f:
-                parts = line.strip().split("\t")
-                if parts:
-                    history_invalid.add(parts[0].strip().upper())
-        print(f"📜 Loaded {len(history_invalid)} invalid words from history_invalid.txt")
-    except FileNotFoundError:
-        print("⚠️ history_invalid.txt not found; continuing without it.")
+    # --- Resume the rounds from before the restart (once; on_ready also fires on reconnect) ---
+    if not rounds_restored:
+        rounds_restored = True
+        await restore_rounds()
 
     # --- Start background tasks ---
     if not dump_scores_daily.is_running():
         dump_scores_daily.start()
         print("⏰ Started daily score dump task.")
+    if not watch_word_files.is_running():
+        watch_word_files.start()
+        print("👀 Watching word files for changes.")
+    if not refresh_conundrum_meta.is_running():
+        refresh_conundrum_meta.start()  # first run now, so tiers include the history recorded so far
 
 # === Run bot ===
 if __name__ == "__main__":
     token = os.getenv("DISCORD_BOT_TOKEN")
     if not token:
         raise SystemExit("Environment variable DISCORD_BOT_TOKEN is missing.")
-    bot.run(token)
+    # Treat SIGTERM (e.g. `docker stop`) like Ctrl-C so the bot shuts down cleanly
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        bot.run(token)
+    finally:
+        score_log.close()  # log queued events and compact into scores.json
+        if score_db is not None:
+            score_db.close()
+        response_store.close()  # write out any queued responses
+        round_store.close()  # write the last round snapshot
+        conundrum_outcomes.close()  # write any queued conundrum outcomes
+        conundrum_decks.close()  # write the decks' last positions
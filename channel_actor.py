@@ -0,0 +1,124 @@
+"""
+Per-channel game actors
+-----------------------
+Each game channel gets one consumer task that handles its messages one at
+a time, in arrival order, from a bounded queue. Only that task touches the
+channel's round, so guess handling needs no locks.
+
+When a round is flooded and the queue is full, new messages are shed
+(dropped) instead of piling up; the actor counts them, along with queue
+depth and how long messages waited, for `!status`.
+
+Each queued message is tagged with the round it was sent in; if a different
+round is running by the time it reaches the front (e.g. the guess came in
+while the winner was being announced), it is skipped as stale.
+
+Other work on the round (e.g. a timeout) can be queued with submit_call(),
+so it runs in turn with the guesses instead of alongside them. Control work
+that must not be lost, like a moderator starting or stopping the round, goes
+through call(): it waits for room in the queue instead of being shed, runs
+whichever round is on by the time it comes up, and returns the job's result.
+
+Usage (example):
+    from channel_actor import ChannelActor
+    actor = ChannelActor("letters 1234", handle_letters_message, lambda: round_ids.get(1234))
+    actor.submit(message)  # from on_message; returns False if shed
+    actor.submit_call(give_up)  # async def give_up()
+    await actor.call(stop_round)  # async def stop_round(); waits until it has run
+"""
+
+import asyncio
+import functools
+import time
+
+ANY_ROUND = object()  # round tag for jobs that run whichever round is on
+
+
+class ChannelActor:
+    """Single consumer task over a bounded message queue for one channel."""
+
+    def __init__(self, name, handle, current_round=None, maxsize=50):
+        self.name = name
+        self.handle = handle  # async def handle(message)
+        self.current_round = current_round or (lambda: None)
+        self.queue = asyncio.Queue(maxsize)
+        self.task = None
+        # Backpressure metrics
+        self.received = 0
+        self.dequeued = 0
+        self.processed = 0
+        self.shed = 0
+        self.stale = 0
+        self.high_water = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def submit(self, message) -> bool:
+        """Queue a message for the channel's task; False if the queue is full and it was shed."""
+        return self.submit_call(functools.partial(self.handle, message))
+
+    def _start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name=f"actor-{self.name}")
+
+    def submit_call(self, job) -> bool:
+        """Queue `await job()` to run in turn with the channel's messages; False if shed."""
+        self._start()
+        self.received += 1
+        try:
+            self.queue.put_nowait((time.monotonic(), self.current_round(), job))
+        except asyncio.QueueFull:
+            self.shed += 1
+            if self.shed == 1 or self.shed % 100 == 0:
+                print(f"⚠️ {self.name}: guess queue full, shed {self.shed} messages so far")
+            return False
+        self.high_water = max(self.high_water, self.queue.qsize())
+        return True
+
+    async def call(self, job):
+        """Run `await job()` in turn with the channel's messages, never shed or skipped; returns its result."""
+        done = asyncio.get_running_loop().create_future()
+
+        async def run():
+            try:
+                done.set_result(await job())
+            except Exception as e:
+                done.set_exception(e)  # raised to the caller, not logged by the actor
+
+        self._start()
+        self.received += 1
+        await self.queue.put((time.monotonic(), ANY_ROUND, run))
+        self.high_water = max(self.high_water, self.queue.qsize())
+        return await done
+
+    async def _run(self):
+        while True:
+            queued_at, round_id, job = await self.queue.get()
+            self.dequeued += 1
+            try:
+                wait = time.monotonic() - queued_at
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+                if round_id is not ANY_ROUND and round_id != self.current_round():
+                    self.stale += 1
+                    continue
+                await job()
+                self.processed += 1
+            except Exception as e:
+                # Keep the channel alive; one bad message shouldn't stop the game
+                print(f"❌ {self.name}: error handling message: {e!r}")
+            finally:
+                self.queue.task_done()
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def status_line(self):
+        avg_wait = self.total_wait / self.dequeued * 1000 if self.dequeued else 0.0
+        return (
+            f"{self.name}: {self.queue.qsize()}/{self.queue.maxsize} queued (peak {self.high_water}), "
+            f"{self.processed} handled, {self.stale} stale, {self.shed} shed, "
+            f"wait avg {avg_wait:.0f} ms / max {self.max_wait * 1000:.0f} ms"
+        )
@@ -1,8 +1,21 @@
 CONUNDRUM_CHANNEL_ID = 1424500871365918761
 NUMBERS_CHANNEL_ID = 1431380518179573911
+LETTERS_CHANNEL_ID = 1438454341920100423
 
 TEST_GENERAL_CHANNEL_ID = 1424857126878052413
 TEST_CONUNDRUMS_CHANNEL_ID = 1433910612009816356
 TEST_NUMBERS_CHANNEL_ID = 1430278725739479153
+TEST_LETTERS_CHANNEL_ID = 1436448481182220328
+
+# Game played in each quiz channel; bot.py routes messages through this map,
+# so a new game channel only needs a line here
+GAME_CHANNELS = {
+    CONUNDRUM_CHANNEL_ID: "conundrum",
+    TEST_CONUNDRUMS_CHANNEL_ID: "conundrum",
+    NUMBERS_CHANNEL_ID: "numbers",
+    TEST_NUMBERS_CHANNEL_ID: "numbers",
+    LETTERS_CHANNEL_ID: "letters",
+    TEST_LETTERS_CHANNEL_ID: "letters",
+}
 
 SCORES_FILE = "scores.json"
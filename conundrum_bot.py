@@ -2,15 +2,11 @@ import random
 import asyncio
 from discord.ext import commands
 import config
+from word_store import WordStore
 
 def setup(bot: commands.Bot):
     # --- Load word list ---
-    WORDS = []
-    with open("conundrums.txt", encoding="utf-8") as f:
-        for line in f:
-            w = line.strip()
-            if w:
-                WORDS.append(w)
+    WORDS = WordStore.from_file("conundrums.txt")
 
     # --- Active puzzles and locks ---
     if not hasattr(bot, "con_current"):
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Conundrum metadata
+------------------
+Offline-built table describing every conundrum: how many valid nine-letter
+answers its letters have, how rare its letters are, and how players have
+fared with it (median solve time, give-up rate). Each word gets a difficulty
+tier so the picker can draw from a tier in O(1).
+
+Build step (the Dockerfile runs it, so a fresh image has letter-based tiers):
+    python conundrum_meta.py
+
+The bot appends one line per finished round to conundrum_history.tsv through
+an OutcomeLog, and rebuilds the table from that history while it runs, so
+the tiers follow real solve times rather than the build-time estimate.
+"""
+
+import math
+import os
+import queue
+import statistics
+import threading
+import time
+from collections import Counter
+
+from word_store import WordStore
+
+META_FILE = "conundrum_meta.tsv"
+OUTCOMES_FILE = "conundrum_history.tsv"
+TIERS = ("easy", "medium", "hard")
+MIN_ROUNDS = 3  # rounds needed before solve history overrides the letter-based estimate
+
+META_COLUMNS = ("word", "answers", "rarity", "rounds", "median_seconds", "giveup_rate", "tier")
+
+
+class OutcomeLog:
+    """Appends finished rounds to the outcome history from a background thread."""
+
+    _STOP = object()
+
+    def __init__(self, filename=OUTCOMES_FILE):
+        self.filename = filename
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="conundrum-outcome-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, word, outcome, seconds):
+        """Queue one finished round ("solved", "gaveup" or "expired"); returns immediately."""
+        self._queue.put(f"{word}\t{outcome}\t{seconds:.1f}\t{int(time.time())}\n")
+
+    def _write_loop(self):
+        while True:
+            lines = [self._queue.get()]
+            # Drain whatever else is waiting so it goes in the same write
+            while True:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = self._STOP in lines
+            lines = [line for line in lines if line is not self._STOP]
+            if lines:
+                try:
+                    with open(self.filename, "a", encoding="utf-8") as f:
+                        f.writelines(lines)
+                except OSError as e:
+                    print(f"⚠️ Could not record {len(lines)} conundrum outcomes: {e}")
+            if stopping:
+                return
+
+    def close(self):
+        """Write everything still queued, then stop the writer."""
+        if self._writer.is_alive():
+            self._queue.put(self._STOP)
+            self._writer.join()
+
+
+def read_outcomes(filename=OUTCOMES_FILE) -> dict:
+    """{WORD: (list of solve times in seconds, number of give-ups)}"""
+    outcomes = {}
+    try:
+        with open(filename, encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) < 3:
+                    continue
+                word, outcome, seconds = parts[0].upper(), parts[1], parts[2]
+                solves, giveups = outcomes.get(word, ([], 0))
+                if outcome == "solved":
+                    solves.append(float(seconds))
+                elif outcome == "gaveup":
+                    giveups += 1
+                # "expired" (timed out with nobody playing) says nothing about difficulty
+                outcomes[word] = (solves, giveups)
+    except FileNotFoundError:
+        pass
+    return outcomes
+
+
+def letter_rarity_table(words) -> dict:
+    """Information content (bits) of each letter, from its frequency across the word list."""
+    counts = Counter()
+    for word in words:
+        counts.update(word)
+    total = sum(counts.values())
+    return {letter: -math.log2(n / total) for letter, n in counts.items()}
+
+
+def history_tier(median_seconds, giveup_rate):
+    if giveup_rate >= 0.5 or median_seconds >= 120:
+        return "hard"
+    if giveup_rate < 0.2 and median_seconds < 30:
+        return "easy"
+    return "medium"
+
+
+def build_meta(word_lists, outcomes) -> list:
+    """One row (dict keyed by META_COLUMNS) per conundrum."""
+    rarity_of = letter_rarity_table(word_lists.history.valid.words)
+    rows = []
+    for word in word_lists.conundrums:
+        answers = max(1, len(word_lists.valid_anagrams(word)))
+        rarity = sum(rarity_of.get(ch, 0.0) for ch in word) / len(word)
+        solves, giveups = outcomes.get(word, ([], 0))
+        rounds = len(solves) + giveups
+        rows.append({
+            "word": word,
+            "answers": answers,
+            "rarity": rarity,
+            "rounds": rounds,
+            "median_seconds": statistics.median(solves) if solves else None,
+            "giveup_rate": giveups / rounds if rounds else None,
+            "tier": None,
+        })
+
+    # Letter-based estimate: rarity tertiles, one tier easier if there's more than one answer
+    by_rarity = sorted(rows, key=lambda r: r["rarity"])
+    for rank, row in enumerate(by_rarity):
+        tier = min(2, rank * 3 // len(by_rarity))
+        if row["answers"] > 1:
+            tier = max(0, tier - 1)
+        row["tier"] = TIERS[tier]
+
+    # Enough solve history beats the estimate
+    for row in rows:
+        if row["rounds"] >= MIN_ROUNDS:
+            median = row["median_seconds"] if row["median_seconds"] is not None else float("inf")
+            row["tier"] = history_tier(median, row["giveup_rate"])
+    return rows
+
+
+def write_meta(rows, filename=META_FILE):
+    tmp = filename + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\t".join(META_COLUMNS) + "\n")
+        for row in rows:
+            values = []
+            for col in META_COLUMNS:
+                value = row[col]
+                if value is None:
+                    values.append("")
+                elif isinstance(value, float):
+                    values.append(f"{value:.3f}")
+                else:
+                    values.append(str(value))
+            f.write("\t".join(values) + "\n")
+    os.replace(tmp, filename)
+
+
+class ConundrumMeta:
+    """Loaded metadata table with one WordStore per difficulty tier."""
+
+    def __init__(self, rows: dict, tiers: dict):
+        self.rows = rows  # WORD -> {"answers", "rarity", "rounds", "median_seconds", "giveup_rate", "tier"}
+        self.tiers = tiers  # tier name -> WordStore
+
+    def get(self, word):
+        return self.rows.get(word.upper())
+
+    def tier_sizes(self):
+        return {tier: len(words) for tier, words in self.tiers.items()}
+
+
+def load_conundrum_meta(filename=META_FILE) -> ConundrumMeta | None:
+    """Load the metadata table, or None if it hasn't been built."""
+    rows = {}
+    by_tier = {tier: [] for tier in TIERS}
+    try:
+        with open(filename, encoding="utf-8") as f:
+            header = f.readline().rstrip("\n").split("\t")
+            for line in f:
+                row = dict(zip(header, line.rstrip("\n").split("\t")))
+                word = row["word"]
+                rows[word] = {
+                    "answers": int(row["answers"]),
+                    "rarity": float(row["rarity"]),
+                    "rounds": int(row["rounds"]),
+                    "median_seconds": float(row["median_seconds"]) if row["median_seconds"] else None,
+                    "giveup_rate": float(row["giveup_rate"]) if row["giveup_rate"] else None,
+                    "tier": row["tier"],
+                }
+                by_tier.setdefault(row["tier"], []).append(word)
+    except FileNotFoundError:
+        print(f"⚠️ {filename} not found; conundrums will be picked without difficulty data.")
+        return None
+    except (KeyError, ValueError) as e:
+        print(f"⚠️ Could not read {filename} ({e}); conundrums will be picked without difficulty data.")
+        return None
+    return ConundrumMeta(rows, {tier: WordStore(words) for tier, words in by_tier.items()})
+
+
+def rebuild_conundrum_meta(word_lists, meta_file=META_FILE, outcomes_file=OUTCOMES_FILE):
+    """Rebuild the table with the current solve history, write it, and return the rows."""
+    rows = build_meta(word_lists, read_outcomes(outcomes_file))
+    write_meta(rows, meta_file)
+    return rows
+
+
+if __name__ == "__main__":
+    from wordlists import load_word_lists
+
+    rows = rebuild_conundrum_meta(load_word_lists())
+    tiers = Counter(row["tier"] for row in rows)
+    with_history = sum(1 for row in rows if row["rounds"] >= MIN_ROUNDS)
+    print(
+        f"✅ Wrote {META_FILE}: {len(rows)} conundrums "
+        f"({', '.join(f'{tiers[t]} {t}' for t in TIERS)}; {with_history} rated from solve history)"
+    )
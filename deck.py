@@ -0,0 +1,117 @@
+"""
+Shuffled decks
+--------------
+Draw items from a list without replacement, so every conundrum comes up once
+before any repeats. Each deck is stored as just (seed, cursor, size) plus a
+fingerprint of the list it was dealt from: the order is regenerated from the
+seed when needed, and the cursor says how far through it we are. When a deck
+runs out it is reshuffled with a new seed; if the list itself changes (a word
+list reload), the deck starts over.
+
+A deck can also deal only the items that pass a filter (e.g. one difficulty
+tier), skipping the rest. The deck still runs over the whole list, so the
+filter can change between draws without anything repeating.
+
+Saving is done by a background writer, so a draw never waits on disk.
+
+Usage (example):
+    from deck import DeckStore
+    decks = DeckStore("conundrum_decks.json")
+    word = decks.draw("1234:any", WORDS)  # any sequence supporting len() and []
+    word = decks.draw("1234:hard", WORDS, accept=lambda w: w in hard_words)
+    decks.close()
+"""
+
+import hashlib
+import json
+import random
+from array import array
+
+from persistence import LatestJsonWriter
+
+
+def fingerprint(items) -> str:
+    """Identifies an item list by content, so a reloaded list of the same size still counts as new."""
+    if hasattr(items, "fingerprint"):
+        return items.fingerprint()
+    digest = hashlib.blake2b(digest_size=8)
+    for item in items:
+        digest.update(str(item).encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+class ShuffledDeck:
+    """A permutation of range(size) defined by a seed, and a position in it."""
+
+    def __init__(self, size, seed=None, cursor=0, source=None):
+        self.size = size
+        self.seed = random.randrange(2**63) if seed is None else seed
+        self.cursor = cursor
+        self.source = source  # fingerprint of the list the deck deals from
+        self._order = None  # built lazily from the seed
+
+    def _build_order(self):
+        order = list(range(self.size))
+        random.Random(self.seed).shuffle(order)
+        self._order = array("I", order)
+
+    def draw(self) -> int:
+        """Next index; reshuffles with a fresh seed once every index has been drawn."""
+        if self.cursor >= self.size:
+            self.seed = random.randrange(2**63)
+            self.cursor = 0
+            self._order = None
+        if self._order is None:
+            self._build_order()
+        index = self._order[self.cursor]
+        self.cursor += 1
+        return index
+
+    def to_dict(self):
+        return {"size": self.size, "seed": self.seed, "cursor": self.cursor, "source": self.source}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["size"], data["seed"], data["cursor"], data.get("source"))
+
+
+class DeckStore:
+    """Named decks persisted to a small JSON file after every draw."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.decks = {}
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                self.decks = {name: ShuffledDeck.from_dict(d) for name, d in json.load(f).items()}
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Could not read {filename} ({e}); starting fresh decks.")
+        self._writer = LatestJsonWriter(filename)
+
+    def draw(self, name, items, accept=None):
+        """
+        Draw the next item from the named deck over `items` that passes `accept`
+        (if given). None if a whole deck's worth of items were all rejected.
+        """
+        source = fingerprint(items)
+        deck = self.decks.get(name)
+        if deck is None or deck.size != len(items) or deck.source != source:
+            # New deck, or the list changed (e.g. after a word list reload)
+            deck = self.decks[name] = ShuffledDeck(len(items), source=source)
+        item = None
+        for _ in range(deck.size):
+            candidate = items[deck.draw()]
+            if accept is None or accept(candidate):
+                item = candidate
+                break
+        self.save()
+        return item
+
+    def save(self):
+        self._writer.save({name: deck.to_dict() for name, deck in self.decks.items()})
+
+    def close(self):
+        """Write the last draw's state and stop the writer."""
+        self._writer.close()
@@ -0,0 +1,378 @@
+"""
+FocalTools API client
+---------------------
+Async wrapper around the FocalTools word endpoints used by bot.py
+(checkword, getmaxes, getwords, define) with a TTL response cache in front
+(optionally backed by a persistent ResponseStore), single-flight
+coalescing of identical concurrent lookups, a circuit breaker that fails
+fast while the API is unhealthy, and latency-aware timeouts with optional
+hedged requests.
+
+Usage (example):
+    from focaltools import FocalToolsClient
+    focaltools = FocalToolsClient()
+    text = await focaltools.checkword("AARDVARK", ip="someone")
+"""
+
+import asyncio
+import time
+import urllib.parse
+from collections import OrderedDict, deque
+
+import aiohttp
+
+BASE_URL = "https://focaltools.azurewebsites.net/api"
+REQUEST_TIMEOUT = 10  # seconds; also the ceiling for adaptive timeouts
+MIN_TIMEOUT = 2  # seconds; floor for adaptive timeouts
+TIMEOUT_MULTIPLIER = 3  # adaptive timeout = p99 latency x this
+MIN_LATENCY_SAMPLES = 20  # below this, use REQUEST_TIMEOUT and don't hedge
+
+# How long each endpoint's answers stay fresh. Word lists only change on
+# dictionary updates, so these can be generous.
+DEFAULT_TTLS = {
+    "checkword": 6 * 3600,
+    "getmaxes": 24 * 3600,
+    "getwords": 24 * 3600,
+    "define": 24 * 3600,
+}
+NEGATIVE_TTL = 3600  # invalid words / missing definitions
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a per-entry TTL."""
+
+    def __init__(self, maxsize=5000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key):
+        """Return (True, value) on a fresh hit, (False, None) otherwise."""
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def set(self, key, value, ttl):
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def is_negative(endpoint, text):
+    """True if a response means 'no such word' and should use the negative TTL."""
+    body = text.strip().strip('"').lower()
+    if endpoint == "checkword":
+        return "false" in body
+    if endpoint == "define":
+        return "invalid" in body or "definition not found" in body
+    return False
+
+
+class LatencyTracker:
+    """Rolling window of recent request latencies (seconds) for one endpoint."""
+
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def quantile(self, q):
+        """Latency at quantile q (0-1) of the current window, or None if empty."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def __len__(self):
+        return len(self.samples)
+
+
+class FocalToolsUnavailable(aiohttp.ClientError):
+    """Raised without making a request while the circuit breaker is open."""
+
+
+def is_upstream_failure(error):
+    """
+    Whether a failed request says the API is unhealthy. A 4xx reply (other
+    than timeouts and rate limits) means it answered and rejected our input,
+    e.g. junk sent to !check, so it doesn't count against the breaker.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status in (408, 429)
+    return True
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of recent requests and stops sending new ones when
+    too many fail:
+      closed    -> requests flow; opens when the failure rate over the last
+                   `window` calls reaches `failure_threshold`
+      open      -> requests fail fast for `cooldown` seconds
+      half-open -> one trial request is let through; success closes the
+                   breaker, failure re-opens it
+    """
+
+    def __init__(self, window=20, min_calls=5, failure_threshold=0.5, cooldown=30):
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.outcomes = deque(maxlen=window)  # True = success
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half-open"
+
+    def failure_rate(self):
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def allow(self):
+        """Whether a new request may be sent right now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            # Trial succeeded: start afresh
+            self.opened_at = None
+            self.outcomes.clear()
+        self.trial_in_flight = False
+        self.outcomes.append(True)
+
+    def record_failure(self):
+        self.trial_in_flight = False
+        self.outcomes.append(False)
+        if self.opened_at is not None:
+            self.opened_at = time.monotonic()  # trial failed: stay open
+        elif len(self.outcomes) >= self.min_calls and self.failure_rate() >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+
+    def status_line(self):
+        line = f"Circuit breaker: **{self.state}**, {self.failure_rate():.0%} of last {len(self.outcomes)} calls failed"
+        if self.state == "open":
+            remaining = self.cooldown - (time.monotonic() - self.opened_at)
+            line += f", retrying in {remaining:.0f}s"
+        return line + f" (opened {self.times_opened}x)"
+
+
+class FocalToolsClient:
+    """Cached access to the FocalTools API. Every method returns the raw response text."""
+
+    def __init__(self, cache_size=5000, ttls=None, negative_ttl=NEGATIVE_TTL, hedge=True, store=None):
+        self.cache = TTLCache(cache_size)
+        self.store = store  # optional ResponseStore consulted on memory misses
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.negative_ttl = negative_ttl
+        self.hits = {endpoint: 0 for endpoint in self.ttls}
+        self.disk_hits = {endpoint: 0 for endpoint in self.ttls}
+        self.misses = {endpoint: 0 for endpoint in self.ttls}
+        self.coalesced = {endpoint: 0 for endpoint in self.ttls}
+        self._inflight = {}  # cache key -> task fetching it
+        self.breaker = CircuitBreaker()
+        self.hedge = hedge
+        self.latency = {endpoint: LatencyTracker() for endpoint in self.ttls}
+        self.hedges_sent = {endpoint: 0 for endpoint in self.ttls}
+        self.hedges_won = {endpoint: 0 for endpoint in self.ttls}
+
+    async def _fetch(self, endpoint, arg, ip, timeout=REQUEST_TIMEOUT):
+        url = f"{BASE_URL}/{endpoint}/{urllib.parse.quote(arg, safe='*')}?ip={urllib.parse.quote(ip)}"
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                response.raise_for_status()
+                return await response.text()
+
+    def timeout_for(self, endpoint):
+        """Total timeout for the next request: a multiple of recent p99 latency, within bounds."""
+        tracker = self.latency[endpoint]
+        if len(tracker) < MIN_LATENCY_SAMPLES:
+            return REQUEST_TIMEOUT
+        return min(REQUEST_TIMEOUT, max(MIN_TIMEOUT, tracker.quantile(0.99) * TIMEOUT_MULTIPLIER))
+
+    def hedge_delay(self, endpoint):
+        """How long to wait before sending a hedged duplicate request (None = don't hedge)."""
+        tracker = self.latency[endpoint]
+        if not self.hedge or len(tracker) < MIN_LATENCY_SAMPLES:
+            return None
+        return tracker.quantile(0.95)
+
+    async def _timed_fetch(self, endpoint, arg, ip, timeout):
+        start = time.monotonic()
+        try:
+            text = await self._fetch(endpoint, arg, ip, timeout)
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            # Failures count too: a timed-out call took at least the whole timeout,
+            # and leaving it out would keep the estimate low while the API is slow
+            self.latency[endpoint].record(time.monotonic() - start)
+            raise
+        self.latency[endpoint].record(time.monotonic() - start)
+        return text
+
+    async def _hedged_fetch(self, endpoint, arg, ip):
+        """
+        Send the request; if it hasn't answered within the endpoint's p95
+        latency, send a second identical one and take whichever succeeds first.
+        """
+        timeout = self.timeout_for(endpoint)
+        delay = self.hedge_delay(endpoint)
+        first = asyncio.ensure_future(self._timed_fetch(endpoint, arg, ip, timeout))
+        tasks = {first}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    self.hedges_sent[endpoint] += 1
+                    tasks.add(asyncio.ensure_future(self._timed_fetch(endpoint, arg, ip, timeout)))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.hedges_won[endpoint] += 1
+                        return task.result()
+            return first.result()  # every attempt failed: raise the original error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _load(self, endpoint, key, arg, ip):
+        if self.store is not None:
+            text, ttl_left = await self.store.get(*key)
+            if text is not None:
+                self.disk_hits[endpoint] += 1
+                self.cache.set(key, text, ttl_left)
+                return text
+
+        if not self.breaker.allow():
+            raise FocalToolsUnavailable("FocalTools is unavailable (circuit breaker open)")
+        self.misses[endpoint] += 1
+        try:
+            text = await self._hedged_fetch(endpoint, arg, ip)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            if is_upstream_failure(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        else:
+            self.breaker.record_success()
+        finally:
+            # However the call ended (including cancellation or an unexpected
+            # error), a half-open breaker may send its next trial
+            self.breaker.trial_in_flight = False
+        ttl = self.negative_ttl if is_negative(endpoint, text) else self.ttls[endpoint]
+        self.cache.set(key, text, ttl)
+        if self.store is not None:
+            self.store.put(*key, text, ttl)
+        return text
+
+    def _finish(self, key, task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+    async def get(self, endpoint, arg, ip="c4c"):
+        """
+        Return the response text for endpoint/arg, from the memory cache or the
+        persistent store when fresh, otherwise from the API. Concurrent callers
+        asking for the same key share a single request. The cache key ignores
+        `ip`, which FocalTools only uses for attribution. Errors (timeouts, HTTP
+        errors) propagate to every waiter and are never cached; while the
+        circuit breaker is open, FocalToolsUnavailable is raised at once.
+        """
+        key = (endpoint, arg.strip().upper())
+        hit, text = self.cache.get(key)
+        if hit:
+            self.hits[endpoint] += 1
+            return text
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(endpoint, key, arg.strip(), ip))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced[endpoint] += 1
+
+        # Shield so one caller being cancelled doesn't cancel the others' request
+        return await asyncio.shield(task)
+
+    async def checkword(self, word, ip="c4c"):
+        return await self.get("checkword", word, ip)
+
+    async def getmaxes(self, selection, ip="c4c"):
+        return await self.get("getmaxes", selection, ip)
+
+    async def getwords(self, letters, ip="c4c"):
+        return await self.get("getwords", letters, ip)
+
+    async def define(self, word, ip="c4c"):
+        return await self.get("define", word, ip)
+
+    def hit_rate(self, endpoint=None):
+        """Fraction of lookups that didn't need their own request (overall, or for one endpoint)."""
+        endpoints = [endpoint] if endpoint else list(self.hits)
+        hits = sum(self.hits[e] + self.disk_hits[e] + self.coalesced[e] for e in endpoints)
+        total = hits + sum(self.misses[e] for e in endpoints)
+        return hits / total if total else 0.0
+
+    @property
+    def available(self):
+        """False while the breaker is open and lookups would fail fast."""
+        return self.breaker.state != "open"
+
+    def stats_lines(self):
+        """Human-readable breaker state and cache statistics, one line per endpoint."""
+        lines = [
+            self.breaker.status_line(),
+            f"Cache: {len(self.cache)}/{self.cache.maxsize} entries, {self.hit_rate():.0%} hit rate, "
+            f"{len(self._inflight)} in flight"
+        ]
+        for endpoint in self.hits:
+            lines.append(
+                f"  {endpoint}: {self.hits[endpoint]} hits / {self.disk_hits[endpoint]} disk hits"
+                f" / {self.coalesced[endpoint]} coalesced"
+                f" / {self.misses[endpoint]} misses"
+            )
+        lines.append("Latency (last 200 requests per endpoint):")
+        for endpoint, tracker in self.latency.items():
+            if not len(tracker):
+                continue
+            lines.append(
+                f"  {endpoint}: p50 {tracker.quantile(0.5) * 1000:.0f} ms"
+                f" / p95 {tracker.quantile(0.95) * 1000:.0f} ms"
+                f" / p99 {tracker.quantile(0.99) * 1000:.0f} ms,"
+                f" timeout {self.timeout_for(endpoint):.1f}s,"
+                f" hedges {self.hedges_won[endpoint]}/{self.hedges_sent[endpoint]} won"
+            )
+        return lines
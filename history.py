@@ -0,0 +1,194 @@
+"""
+Word history index
+------------------
+Loads history_valid.txt and history_invalid.txt once into compact tables
+(a WordStore plus one small date id per word), with each distinct date string
+parsed up front, so `!check` can describe when a word became valid (or was
+removed) without touching the files again.
+
+Usage (example):
+    from history import HistoryIndex
+    history = HistoryIndex.load()
+    history.describe("AASVOEL", valid=True)
+"""
+
+import datetime
+import re
+from array import array
+from collections import namedtuple
+
+from word_store import WordStore
+
+VALID_FILE = "history_valid.txt"
+INVALID_FILE = "history_invalid.txt"
+
+# kind is one of "exact", "between", "pre2006" or "unknown"
+HistoryDate = namedtuple("HistoryDate", "kind year month end_year raw")
+
+# Removals that happened in one go get a name of their own
+CULL_EVENTS = {
+    (2016, 6): "This word was removed in the Great OED Variant Cull of June 2016.",
+    (2024, 8): "This word was removed in the Great Dictionary Reset of August 2024.",
+}
+
+_EXACT_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{2,4})")
+_BETWEEN_RE = re.compile(r"between\s+(\d{4})\s*[-–]\s*(\d{4})", re.IGNORECASE)
+_PRE_2006_RE = re.compile(r"pre[-–]?\s*2006", re.IGNORECASE)
+
+
+def parse_date(date_str: str) -> HistoryDate:
+    """Parse a history file date string into a HistoryDate."""
+    m = _EXACT_RE.match(date_str)
+    if m:
+        _day, month, year = map(int, m.groups())
+        if year < 100:
+            year += 2000
+        return HistoryDate("exact", year, month, None, date_str)
+
+    m = _BETWEEN_RE.match(date_str)
+    if m:
+        y1, y2 = map(int, m.groups())
+        return HistoryDate("between", y1, None, y2, date_str)
+
+    if _PRE_2006_RE.match(date_str):
+        return HistoryDate("pre2006", None, None, None, date_str)
+
+    return HistoryDate("unknown", None, None, None, date_str)
+
+
+def format_history_message(date: HistoryDate | None, valid=True) -> str:
+    """Turn a parsed history date into the sentence shown by !check."""
+    if date is None:
+        return (
+            "I can't find a record of when this word became valid; it was probably very recently added."
+            if valid
+            else "I can't find a record of this word being removed; it may never have been valid."
+        )
+
+    if date.kind == "exact":
+        if not valid and (date.year, date.month) in CULL_EVENTS:
+            return CULL_EVENTS[(date.year, date.month)]
+        month_name = datetime.date(date.year, date.month, 1).strftime("%B")
+        if valid:
+            return f"This word has been valid since {month_name} {date.year}."
+        return f"This word was removed in {month_name} {date.year}."
+
+    if date.kind == "between":
+        if valid:
+            return f"This word became valid sometime between {date.year} and {date.end_year}."
+        return f"This word was removed sometime between {date.year} and {date.end_year}."
+
+    if date.kind == "pre2006":
+        if valid:
+            return "This word has likely always been valid."
+        return "This word was removed before 2006."
+
+    return f"(Unrecognized date format: {date.raw})"
+
+
+def date_order(date: HistoryDate) -> tuple:
+    """Sort key placing a history date on a (year, month) timeline."""
+    if date.kind == "exact":
+        return (date.year, date.month)
+    if date.kind == "between":
+        return (date.end_year, 12)
+    if date.kind == "pre2006":
+        return (2005, 12)
+    return (0, 0)
+
+
+class HistoryTable:
+    """Words from one history file, each mapped to its parsed date."""
+
+    def __init__(self, words: WordStore, date_ids: array, dates: list):
+        self.words = words
+        self.date_ids = date_ids  # date_ids[i] indexes dates for words[i]
+        self.dates = dates
+
+    def get(self, word: str) -> HistoryDate | None:
+        i = self.words.index(word)
+        return self.dates[self.date_ids[i]] if i >= 0 else None
+
+    def __contains__(self, word) -> bool:
+        return word in self.words
+
+    def __len__(self):
+        return len(self.words)
+
+    def nbytes(self) -> int:
+        return self.words.nbytes() + self.date_ids.itemsize * len(self.date_ids)
+
+
+def load_history_file(filename: str) -> HistoryTable:
+    """
+    Read a tab-separated history file into a HistoryTable.
+    Each distinct date string is parsed once and shared between its words.
+    Returns an empty table if the file is missing.
+    """
+    entries = {}
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.strip().split("\t")
+                if len(parts) < 2:
+                    continue
+                # first entry wins, as with the old linear scan
+                entries.setdefault(parts[0].strip().upper(), parts[1].strip())
+    except FileNotFoundError:
+        print(f"⚠️ {filename} not found; continuing without it.")
+
+    words = sorted(entries)
+    dates = []
+    date_index = {}
+    date_ids = array("H")
+    for word in words:
+        date_str = entries[word]
+        if date_str not in date_index:
+            date_index[date_str] = len(dates)
+            dates.append(parse_date(date_str))
+        date_ids.append(date_index[date_str])
+    return HistoryTable(WordStore.from_sorted(words), date_ids, dates)
+
+
+class HistoryIndex:
+    """In-memory index of when words became valid or were removed."""
+
+    def __init__(self, valid: HistoryTable, invalid: HistoryTable):
+        self.valid = valid
+        self.invalid = invalid
+
+    @classmethod
+    def load(cls, valid_file=VALID_FILE, invalid_file=INVALID_FILE):
+        return cls(load_history_file(valid_file), load_history_file(invalid_file))
+
+    def lookup(self, word: str, valid=True) -> HistoryDate | None:
+        table = self.valid if valid else self.invalid
+        return table.get(word)
+
+    def describe(self, word: str, valid=True) -> str:
+        """The !check history sentence for a word."""
+        return format_history_message(self.lookup(word, valid), valid)
+
+    def is_valid(self, word: str) -> bool:
+        """
+        Best local guess at whether a word is currently valid: it has a
+        valid-since date and wasn't removed after that date. Only meaningful
+        for words of up to nine letters, which is all the history covers.
+        """
+        added = self.valid.get(word)
+        if added is None:
+            return False
+        removed = self.invalid.get(word)
+        return removed is None or date_order(removed) < date_order(added)
+
+    def formable(self, letters: str, length: int) -> list:
+        """Currently valid words of the given length that can be made from the letters."""
+        return [w for w in self.valid.words.formable(letters, length) if self.is_valid(w)]
+
+    def maxes(self, letters: str) -> list:
+        """The longest currently valid words that can be made from the letters."""
+        for length in range(len(letters), 0, -1):
+            words = self.formable(letters, length)
+            if words:
+                return words
+        return []
@@ -0,0 +1,103 @@
+"""
+Crash-safe JSON files
+---------------------
+Helpers for saving JSON state from a background thread: the data is copied
+off the live objects first, then written to a temporary file that is
+fsynced and renamed over the original, so a crash can never leave a
+truncated file behind.
+
+LatestJsonWriter does the same for small state saved on every change: save()
+returns at once, and a background thread writes the newest data it was given,
+skipping any older snapshot it hadn't got to yet.
+
+Usage (example):
+    from persistence import LatestJsonWriter, atomic_write_json, copy_json_tree
+    atomic_write_json("scores.json", copy_json_tree(scores), indent=2)
+    writer = LatestJsonWriter("rounds.json")
+    writer.save({"1234": {...}})
+    writer.close()  # write the last snapshot and stop
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+_STOP = object()
+
+
+def atomic_write_json(filename, data, indent=None):
+    """Write JSON to a temp file next to `filename`, fsync it, then rename it into place."""
+    # A temp name of its own, so two writers of the same file can't interleave
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(filename) + ".", suffix=".tmp",
+                               dir=os.path.dirname(filename) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def copy_json_tree(data):
+    """
+    Copy dicts/lists level by level. Each dict()/list() copy is a single C call,
+    so it is safe against the event loop replacing entries meanwhile.
+    """
+    if isinstance(data, dict):
+        return {k: copy_json_tree(v) for k, v in dict(data).items()}
+    if isinstance(data, list):
+        return [copy_json_tree(v) for v in list(data)]
+    return data
+
+
+class LatestJsonWriter:
+    """Latest-wins JSON file written by a background thread."""
+
+    def __init__(self, filename, indent=None):
+        self.filename = filename
+        self.indent = indent
+        self._pending = None
+        self._cond = threading.Condition()
+        self._writer = threading.Thread(
+            target=self._write_loop, name=f"writer-{os.path.basename(filename)}", daemon=True
+        )
+        self._writer.start()
+
+    def save(self, data):
+        """Queue data to be written, replacing any not yet written. Don't mutate it afterwards."""
+        with self._cond:
+            if self._pending is not _STOP:
+                self._pending = data
+                self._cond.notify()
+
+    def _write(self, data):
+        try:
+            atomic_write_json(self.filename, data, self.indent)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Could not save {self.filename}: {e}")
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                data, self._pending = self._pending, None
+            if data is _STOP:
+                return
+            self._write(data)
+
+    def close(self):
+        """Write the last queued data, then stop the writer."""
+        if not self._writer.is_alive():
+            return
+        with self._cond:
+            last = self._pending
+            self._pending = _STOP
+            self._cond.notify()
+        self._writer.join()
+        if last is not None:
+            self._write(last)
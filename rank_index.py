@@ -0,0 +1,127 @@
+"""
+Leaderboard rank index
+----------------------
+Order-statistics index over one score category, kept up to date as points
+are awarded instead of sorting every player on each leaderboard request.
+
+A Fenwick tree over score values counts how many players have each score,
+so "how many players are ahead of me" and "what is the k-th best score" are
+O(log max_score). Players with equal scores share a bucket, listed in the
+order they reached that score; a player's rank is their position in that
+listing, so it always matches the row top() shows them on. Each bucket is a
+list sorted by arrival number, so that position is a bisect too.
+
+Usage (example):
+    from rank_index import RankIndex
+    index = RankIndex()
+    index.update("123", 5)
+    index.top(15)       # [(user_id, score), ...]
+    index.rank("123")   # (rank, score) or None
+"""
+
+import itertools
+from bisect import bisect_left
+
+
+class FenwickTree:
+    """Prefix sums over counts at positions 1..size, growing on demand."""
+
+    def __init__(self, size=1024):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def _grow(self, needed):
+        size = self.size
+        while size < needed:
+            size *= 2
+        counts = [self.prefix(i) - self.prefix(i - 1) for i in range(1, self.size + 1)]
+        self.size = size
+        self.tree = [0] * (size + 1)
+        for i, count in enumerate(counts, 1):
+            if count:
+                self.add(i, count)
+
+    def add(self, i, delta):
+        if i > self.size:
+            self._grow(i)
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i) -> int:
+        """Sum of counts at positions 1..i."""
+        i = min(i, self.size)
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, k) -> int:
+        """Smallest position whose prefix sum is >= k (k must be 1..total)."""
+        pos = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self.tree[nxt] < k:
+                pos = nxt
+                k -= self.tree[nxt]
+            step >>= 1
+        return pos + 1
+
+
+class RankIndex:
+    """Players with a positive score in one category, ranked highest first."""
+
+    def __init__(self):
+        self.scores = {}    # user id -> score
+        self.arrivals = {}  # user id -> arrival number when they reached their score
+        self.buckets = {}   # score -> [(arrival, user id)], in the order players reached it
+        self.arrival_counter = itertools.count()
+        self.counts = FenwickTree()
+        self.total = 0      # sum of all scores
+
+    def __len__(self):
+        return len(self.scores)
+
+    def update(self, user_id, score):
+        """Set a player's score (0 removes them)."""
+        old = self.scores.get(user_id, 0)
+        if old == score:
+            return
+        if old > 0:
+            bucket = self.buckets[old]
+            del bucket[bisect_left(bucket, (self.arrivals.pop(user_id), user_id))]
+            if not bucket:
+                del self.buckets[old]
+            self.counts.add(old, -1)
+            del self.scores[user_id]
+        if score > 0:
+            arrival = self.arrivals[user_id] = next(self.arrival_counter)
+            self.buckets.setdefault(score, []).append((arrival, user_id))  # newest: stays sorted
+            self.counts.add(score, 1)
+            self.scores[user_id] = score
+        self.total += score - old
+
+    def rank(self, user_id):
+        """(rank, score), the player's position in top()'s order. None if they haven't scored."""
+        score = self.scores.get(user_id)
+        if score is None:
+            return None
+        ahead = len(self.scores) - self.counts.prefix(score)
+        # Ties are listed in the order players reached the score
+        tied_ahead = bisect_left(self.buckets[score], (self.arrivals[user_id], user_id))
+        return ahead + tied_ahead + 1, score
+
+    def top(self, n=15) -> list:
+        """[(user_id, score)] for the n best players."""
+        out = []
+        remaining = len(self.scores)  # players with score <= the current one
+        while remaining and len(out) < n:
+            score = self.counts.find(remaining)
+            for _, user_id in self.buckets[score]:
+                out.append((user_id, score))
+                if len(out) == n:
+                    break
+            remaining -= len(self.buckets[score])
+        return out
@@ -0,0 +1,121 @@
+"""
+Persistent response store
+-------------------------
+SQLite-backed key-value store for FocalTools responses (definitions,
+validity answers, maxes), so a restarted bot starts with everything it
+learned before. Writes are queued and committed by a background thread;
+reads run in a worker thread so the event loop never waits on disk.
+
+Usage (example):
+    from response_store import ResponseStore
+    store = ResponseStore("focaltools_cache.sqlite3")
+    store.put("checkword", "AARDVARK", "true", ttl=3600)
+    body, ttl_left = await store.get("checkword", "AARDVARK")
+    stored = await store.count()
+    store.close()
+"""
+
+import asyncio
+import queue
+import sqlite3
+import threading
+import time
+
+_STOP = object()
+
+
+class ResponseStore:
+    """Response bodies keyed by (endpoint, normalised argument), with wall-clock expiry."""
+
+    def __init__(self, filename, batch_size=100):
+        self.filename = filename
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " endpoint TEXT NOT NULL,"
+                " arg TEXT NOT NULL,"
+                " body TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " PRIMARY KEY (endpoint, arg))"
+            )
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="response-store-writer", daemon=True)
+        self._writer.start()
+
+    def _lookup(self, endpoint, arg):
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT body, expires_at FROM responses WHERE endpoint = ? AND arg = ?",
+                    (endpoint, arg),
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Response store read failed: {e}")
+            return None, 0
+        if row is None:
+            return None, 0
+        body, expires_at = row
+        ttl_left = expires_at - time.time()
+        if ttl_left <= 0:
+            return None, 0
+        return body, ttl_left
+
+    async def get(self, endpoint, arg):
+        """Returns (body, seconds until expiry), or (None, 0) if absent or expired."""
+        return await asyncio.to_thread(self._lookup, endpoint, arg)
+
+    def put(self, endpoint, arg, body, ttl):
+        """Queue a response to be written; returns immediately."""
+        self._queue.put((endpoint, arg, body, time.time() + ttl))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            batch = []
+            stopping = item is _STOP
+            if not stopping:
+                batch.append(item)
+            # Drain whatever else is waiting so it goes in the same transaction
+            while not stopping and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+            if batch:
+                try:
+                    with self._lock:
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO responses (endpoint, arg, body, expires_at) VALUES (?, ?, ?, ?)",
+                            batch,
+                        )
+                        self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Response store write failed ({len(batch)} responses lost): {e}")
+            if stopping:
+                return
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    async def count(self):
+        """Number of stored responses, counted in a worker thread."""
+        return await asyncio.to_thread(len, self)
+
+    def close(self):
+        """Write everything still queued, then close the database."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,37 @@
+"""
+Round state snapshots
+---------------------
+Keeps a JSON copy of the rounds in progress, so a restarted bot picks up
+every channel where it left off instead of waiting for `!start_bots`.
+
+The bot builds a small snapshot whenever a round starts, ends or is
+reshuffled and hands it to save(), which returns at once; a background
+thread writes it crash-safely. If several snapshots arrive while a write
+is in progress, only the newest is written.
+
+Usage (example):
+    from round_state import RoundStateFile
+    rounds = RoundStateFile("rounds.json")
+    saved = rounds.load()     # {} if there is no snapshot
+    rounds.save(snapshot)     # any JSON-serialisable dict
+    rounds.close()            # write the last snapshot and stop
+"""
+
+import json
+
+from persistence import LatestJsonWriter
+
+
+class RoundStateFile(LatestJsonWriter):
+    """Latest-wins snapshot of the rounds in progress."""
+
+    def load(self) -> dict:
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            print(f"⚠️ Could not read {self.filename} ({e}); no rounds to resume.")
+            return {}
@@ -0,0 +1,100 @@
+"""
+Timer scheduler
+---------------
+One task runs every delayed job in the bot (round reminders, idle
+timeouts, `!selection` reveals) instead of each keeping a coroutine asleep.
+Jobs sit in a heap ordered by deadline; the task sleeps until the earliest
+one is due or an earlier job is added.
+
+Jobs are named by a key, e.g. ("idle", channel_id). Scheduling a key that
+is already pending moves its deadline, and cancel() drops it. Moving or
+cancelling a job doesn't touch the heap: the outdated entry is skipped when
+it comes up, so both are O(1) apart from the occasional push.
+
+Usage (example):
+    from scheduler import Scheduler
+    timers = Scheduler()
+    timers.schedule(("idle", cid), 1800, give_up)  # give_up: async def give_up()
+    timers.schedule(("idle", cid), 1800, give_up)  # activity: push the deadline back
+    timers.cancel(("idle", cid))                   # round ended early
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class Scheduler:
+    """Named, cancellable delayed jobs driven by a single task."""
+
+    def __init__(self):
+        self.jobs = {}     # key -> (deadline, callback), the live job for each key
+        self.heap = []     # (deadline, tiebreak, key); may hold outdated entries
+        self.counter = itertools.count()
+        self.wake = asyncio.Event()
+        self.task = None
+        self.running = set()  # callbacks in flight, kept referenced until done
+        self.fired = 0
+        self.failed = 0
+
+    def schedule(self, key, delay, callback):
+        """Run `await callback()` in `delay` seconds, replacing any pending job with this key."""
+        deadline = time.monotonic() + delay
+        old = self.jobs.get(key)
+        self.jobs[key] = (deadline, callback)
+        # A later deadline reuses the old heap entry: when it comes up, the job is pushed again
+        if old is None or deadline < old[0]:
+            heapq.heappush(self.heap, (deadline, next(self.counter), key))
+            if self.heap[0][2] == key:
+                self.wake.set()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name="scheduler")
+
+    def cancel(self, key) -> bool:
+        """Drop the pending job with this key; False if there wasn't one."""
+        return self.jobs.pop(key, None) is not None
+
+    def pending(self, key) -> bool:
+        return key in self.jobs
+
+    def _pop_due(self, now):
+        """Live jobs whose deadline has passed, re-pushing any that were moved later."""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(self.heap)
+            job = self.jobs.get(key)
+            if job is None or job[0] < deadline:
+                continue  # cancelled, or moved earlier (its newer entry fires it)
+            if job[0] > deadline:
+                heapq.heappush(self.heap, (job[0], next(self.counter), key))
+                continue
+            del self.jobs[key]
+            due.append(job[1])
+        return due
+
+    async def _run(self):
+        while True:
+            for callback in self._pop_due(time.monotonic()):
+                self.fired += 1
+                task = asyncio.create_task(callback())
+                self.running.add(task)
+                task.add_done_callback(self._finished)
+            timeout = self.heap[0][0] - time.monotonic() if self.heap else None
+            self.wake.clear()
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _finished(self, task):
+        self.running.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.failed += 1
+            print(f"❌ Scheduled job failed: {task.exception()!r}")
+
+    def status_line(self):
+        return (
+            f"Timers: {len(self.jobs)} pending ({len(self.heap)} heap entries), "
+            f"{self.fired} fired, {self.failed} failed"
+        )
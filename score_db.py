@@ -0,0 +1,150 @@
+"""
+SQLite score backend
+--------------------
+Optional alternative to scores.json (set SCORES_BACKEND=sqlite). Each
+player is one row, with an index on every game's score and on the combined
+total, so the top 15 and a player's own rank are index lookups instead of a
+sort over every player.
+
+The score log applies each batch of events here as it writes it; a row's
+last_event column makes re-applying an event a no-op, so replaying the log
+after a crash is safe. On first use an empty database is filled from
+scores.json.
+
+Usage (example):
+    from score_db import ScoreDB
+    db = ScoreDB("scores.sqlite3", migrate_from="scores.json")
+    top = db.top("let_score")           # [(user_id, name, score), ...]
+    rank = db.rank("let_score", "123")  # (rank, score) or None
+    db.close()
+"""
+
+import json
+import sqlite3
+import threading
+
+from score_log import GAME_KEYS
+
+SCORE_COLUMNS = ("con_score", "num_score", "let_score")
+TOTAL = "(con_score + num_score + let_score)"
+
+
+def _column(key):
+    """SQL expression for a score key; None means the combined total."""
+    if key is None:
+        return TOTAL
+    if key not in SCORE_COLUMNS:
+        raise ValueError(f"unknown score column {key!r}")
+    return key
+
+
+class ScoreDB:
+    """Player scores in SQLite (WAL mode), safe to use from worker threads."""
+
+    def __init__(self, filename, migrate_from=None):
+        self.filename = filename
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                " user_id TEXT PRIMARY KEY,"
+                " name TEXT NOT NULL,"
+                " con_score INTEGER NOT NULL DEFAULT 0,"
+                " num_score INTEGER NOT NULL DEFAULT 0,"
+                " let_score INTEGER NOT NULL DEFAULT 0,"
+                " last_event INTEGER NOT NULL DEFAULT 0)"
+            )
+            # user_id breaks ties, so top() lists players in a stable order
+            for col in SCORE_COLUMNS:
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS scores_{col} ON scores ({col} DESC, user_id)")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS scores_total ON scores ({TOTAL} DESC, user_id)")
+            self._conn.commit()
+        if migrate_from and len(self) == 0:
+            self.migrate(migrate_from)
+
+    def migrate(self, filename):
+        """Import a scores.json file into the (empty) table."""
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        rows = [
+            (uid, info.get("name", "Unknown User"), info.get("con_score", 0), info.get("num_score", 0),
+             info.get("let_score", 0), info.get("last_event", 0))
+            for uid, info in data.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO scores (user_id, name, con_score, num_score, let_score, last_event)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+        print(f"📦 Imported {len(rows)} players from {filename} into {self.filename}")
+
+    def load(self) -> dict:
+        """All rows in the same shape as scores.json."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT user_id, name, con_score, num_score, let_score, last_event FROM scores"
+            ).fetchall()
+        return {
+            uid: {"name": name, "con_score": con, "num_score": num, "let_score": let, "last_event": last}
+            for uid, name, con, num, let, last in rows
+        }
+
+    def apply(self, events):
+        """Add a batch of score log events in one transaction, skipping any already applied."""
+        with self._lock:
+            for event in events:
+                col = GAME_KEYS[event["game"]]
+                self._conn.execute(
+                    f"INSERT INTO scores (user_id, name, {col}, last_event) VALUES (?, ?, ?, ?)"
+                    f" ON CONFLICT (user_id) DO UPDATE SET name = excluded.name,"
+                    f" {col} = {col} + excluded.{col}, last_event = excluded.last_event"
+                    f" WHERE last_event < excluded.last_event",
+                    (event["user"], event["name"], event["points"], event["seq"]),
+                )
+            self._conn.commit()
+
+    def top(self, key, limit=15) -> list:
+        """[(user_id, name, score)] for the highest non-zero scores."""
+        col = _column(key)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT user_id, name, {col} FROM scores WHERE {col} > 0"
+                f" ORDER BY {col} DESC, user_id LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def rank(self, key, user_id):
+        """(rank, score) of one player, or None if they haven't scored."""
+        col = _column(key)
+        with self._lock:
+            row = self._conn.execute(f"SELECT {col} FROM scores WHERE user_id = ?", (user_id,)).fetchone()
+            if row is None or row[0] <= 0:
+                return None
+            score = row[0]
+            # Position in top()'s order: higher scores, then ties with a smaller user_id
+            ahead = self._conn.execute(
+                f"SELECT COUNT(*) FROM scores WHERE {col} > ? OR ({col} = ? AND user_id < ?)",
+                (score, score, user_id),
+            ).fetchone()[0]
+        return ahead + 1, score
+
+    def total(self, key) -> int:
+        """Sum of everyone's scores for one column (or the combined total)."""
+        with self._lock:
+            return self._conn.execute(f"SELECT COALESCE(SUM({_column(key)}), 0) FROM scores").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
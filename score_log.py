@@ -0,0 +1,271 @@
+"""
+Score event log
+---------------
+Every point awarded is appended to score_events.log as one JSON line
+(user, game, points, bonus type, timestamp, round id, seconds taken to
+solve), so scoring history can be replayed. A background thread does the
+appends in batches, with one fsync per batch, so the event loop never
+waits on disk.
+
+scores.json is the compacted aggregate. Compaction rewrites it from the
+in-memory totals and moves the events it now covers from the log into
+score_events.archive.log. Each score entry remembers the seq of the last
+event applied to it ("last_event"), so replaying the log over scores.json
+after a crash applies each event exactly once, whichever step was
+interrupted.
+
+Usage (example):
+    from score_log import ScoreLog, apply_event, load_scores
+    scores, last_seq = load_scores("scores.json", "score_events.log")
+    log = ScoreLog("score_events.log", "scores.json", lambda: scores, last_seq)
+    apply_event(scores, log.append("123", "alice", "letters", 1, round_id="42-1700000000000"))
+    log.close()  # final compaction on shutdown
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from persistence import atomic_write_json, copy_json_tree
+
+# Game name -> score field in scores.json
+GAME_KEYS = {"conundrum": "con_score", "numbers": "num_score", "letters": "let_score"}
+
+_COMPACT = object()
+_STOP = object()
+
+
+def read_events(filename):
+    """Yield the events in a log file, skipping a line torn by a crash."""
+    try:
+        with open(filename, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def apply_event(scores, event) -> bool:
+    """Add one event to the totals. Returns False if the entry already includes it."""
+    existing = scores.get(event["user"], {})
+    if existing.get("last_event", 0) >= event["seq"]:
+        return False
+    entry = {
+        "name": event["name"],
+        "con_score": existing.get("con_score", 0),
+        "num_score": existing.get("num_score", 0),
+        "let_score": existing.get("let_score", 0),
+        "last_event": event["seq"],
+    }
+    entry[GAME_KEYS[event["game"]]] += event["points"]
+    # Replace rather than mutate, so the writer thread always copies a whole entry
+    scores[event["user"]] = entry
+    return True
+
+
+def load_scores(scores_file, log_file, db=None):
+    """
+    scores.json (or the score database, if given) with any events it doesn't
+    include yet replayed on top. Returns (scores, last seq).
+    """
+    if db is not None:
+        scores = db.load()
+    else:
+        try:
+            with open(scores_file, "r", encoding="utf-8") as f:
+                scores = json.load(f)
+        except FileNotFoundError:
+            scores = {}
+    last_seq = max((info.get("last_event", 0) for info in scores.values()), default=0)
+    replayed = 0
+    events = list(read_events(log_file))
+    for event in events:
+        replayed += apply_event(scores, event)
+        last_seq = max(last_seq, event["seq"])
+    if db is not None:
+        db.apply(events)  # rows skip events they already include
+    if replayed:
+        print(f"📒 Replayed {replayed} score events from {log_file}")
+    return scores, last_seq
+
+
+class ScoreLog:
+    """
+    Append-only event log plus periodic compaction into the scores snapshot.
+    With a ScoreDB, each batch is also applied to the database as it is
+    logged, and scores_file may be None (no JSON snapshot).
+    """
+
+    def __init__(self, filename, scores_file, get_scores, last_seq=0,
+                 compact_interval=60.0, compact_events=500, batch_size=200, db=None, extra_snapshots=()):
+        self.filename = filename
+        self.scores_file = scores_file
+        self.db = db
+        # (filename, get_data) pairs for other state derived from the events, saved on each
+        # compaction. Their data must include every event the scores include by the time it's copied.
+        self.extra_snapshots = extra_snapshots
+        self.archive_file = os.path.splitext(filename)[0] + ".archive.log"
+        self.get_scores = get_scores
+        self.seq = last_seq
+        self.compact_interval = compact_interval
+        self.compact_events = compact_events
+        self.batch_size = batch_size
+        self.appended = 0
+        self.compactions = 0
+        self._since_compaction = 0
+        self._db_behind = False
+        self.db_applied = 0  # successful database writes, so readers can tell when its rows change
+        self._last_compaction = time.monotonic()
+        self._file = self._open_log()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="score-log-writer", daemon=True)
+        self._writer.start()
+
+    def _open_log(self):
+        f = open(self.filename, "a+", encoding="utf-8")
+        # Terminate a line torn by a crash so the next event starts cleanly
+        if f.tell() > 0:
+            f.seek(f.tell() - 1)
+            if f.read(1) != "\n":
+                f.write("\n")
+        return f
+
+    def append(self, user, name, game, points, bonus=None, round_id=None, seconds=None) -> dict:
+        """Queue one scoring event and return it (with its seq); returns immediately."""
+        self.seq += 1
+        event = {
+            "seq": self.seq,
+            "ts": round(time.time(), 3),
+            "user": user,
+            "name": name,
+            "game": game,
+            "points": points,
+            "bonus": bonus,
+            "round": round_id,
+            "seconds": None if seconds is None else round(seconds, 2),
+        }
+        self._queue.put(event)
+        return event
+
+    def compact(self):
+        """Compact now and wait for it to finish. Blocking: call via asyncio.to_thread."""
+        done = threading.Event()
+        self._queue.put((_COMPACT, done))
+        done.wait()
+
+    def _write_loop(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.compact_interval)
+            except queue.Empty:
+                item = None
+            batch = []
+            requests = []
+            stopping = False
+            # Drain whatever else is waiting so it goes out in one write
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, tuple):
+                    requests.append(item[1])
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            if batch:
+                self._write(batch)
+            due = self._since_compaction and (
+                self._since_compaction >= self.compact_events
+                or time.monotonic() - self._last_compaction >= self.compact_interval
+            )
+            if requests or stopping or due:
+                self._compact()
+            for done in requests:
+                done.set()
+            if stopping:
+                self._file.close()
+                return
+
+    def _write(self, batch):
+        try:
+            self._file.write("".join(json.dumps(event) + "\n" for event in batch))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.appended += len(batch)
+            self._since_compaction += len(batch)
+        except OSError as e:
+            print(f"⚠️ Score log write failed ({len(batch)} events not logged): {e}")
+        if self.db is not None:
+            try:
+                self.db.apply(batch)
+                self.db_applied += 1
+            except sqlite3.Error as e:
+                # The events are still in the log; compaction retries them before archiving any
+                self._db_behind = True
+                print(f"⚠️ Score database write failed ({len(batch)} events): {e}")
+
+    def _compact(self):
+        self._last_compaction = time.monotonic()
+        if self._db_behind:
+            try:
+                self.db.apply(list(read_events(self.filename)))
+                self.db_applied += 1
+                self._db_behind = False
+            except sqlite3.Error as e:
+                print(f"⚠️ Score database still failing; keeping the log uncompacted: {e}")
+                return
+        snapshot = copy_json_tree(self.get_scores())
+        # Copied after the scores, so they cover at least the events being archived
+        extras = [(filename, copy_json_tree(get_data())) for filename, get_data in self.extra_snapshots]
+        if self.scores_file is not None:
+            extras.append((self.scores_file, snapshot))
+        for filename, data in extras:
+            try:
+                atomic_write_json(filename, data, indent=2)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"⚠️ Could not save {filename}: {e}")
+                return
+
+        # Events the snapshot covers go to the archive; anything newer stays in the log.
+        # A crash between the two writes can repeat events in the archive (same seq).
+        covered, pending = [], []
+        for event in read_events(self.filename):
+            entry = snapshot.get(event["user"], {})
+            (covered if entry.get("last_event", 0) >= event["seq"] else pending).append(event)
+        try:
+            if covered:
+                with open(self.archive_file, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(event) + "\n" for event in covered))
+                    f.flush()
+                    os.fsync(f.fileno())
+            tmp = self.filename + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("".join(json.dumps(event) + "\n" for event in pending))
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(tmp, self.filename)
+            self._file = self._open_log()
+        except OSError as e:
+            print(f"⚠️ Score log compaction failed: {e}")
+            if self._file.closed:
+                self._file = self._open_log()
+            return
+        self._since_compaction = len(pending)
+        self.compactions += 1
+
+    def close(self):
+        """Write everything still queued, compact, and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
@@ -0,0 +1,111 @@
+"""
+Time-windowed scores
+--------------------
+Per-user points for the current day, week and month (UTC), for
+`!points week` and friends. Each period keeps a few buckets keyed by
+period id ("2026-10-19", "2026-W42", "2026-10"); a point lands in the
+bucket for its timestamp, and starting a new bucket drops the oldest, so
+rollover is O(1) and memory is bounded by the retention.
+
+The buckets are saved with the score log's compactions. Like scores.json,
+each entry remembers the seq of the last event applied to it, so events
+still in the log can be replayed into them at startup exactly once.
+
+Usage (example):
+    from score_windows import ScoreWindows
+    windows = ScoreWindows.load("score_windows.json")
+    windows.add(event)                 # a score log event
+    windows.get("week")                # (period id, {user id: entry})
+"""
+
+import datetime
+import json
+
+from score_log import GAME_KEYS
+
+PERIODS = ("day", "week", "month")
+RETENTION = {"day": 2, "week": 2, "month": 2}  # buckets kept per period (current + previous)
+
+
+def period_id(period, ts) -> str:
+    """Id of the day/week/month (UTC) containing the Unix timestamp ts."""
+    when = datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc)
+    if period == "day":
+        return when.strftime("%Y-%m-%d")
+    if period == "week":
+        year, week, _ = when.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "month":
+        return when.strftime("%Y-%m")
+    raise ValueError(f"unknown period {period!r}")
+
+
+class ScoreWindows:
+    """Bucketed per-user scores for each period, oldest bucket first."""
+
+    def __init__(self, buckets=None):
+        # period -> {period id -> {user id: entry}}, oldest first. Plain dicts (not
+        # OrderedDict) so the log thread can copy them while the event loop adds points.
+        self.buckets = {period: {} for period in PERIODS}
+        for period, by_id in (buckets or {}).items():
+            if period in self.buckets:
+                self.buckets[period] = dict(sorted(by_id.items()))
+
+    @classmethod
+    def load(cls, filename):
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls()
+        except (ValueError, AttributeError) as e:
+            print(f"⚠️ Could not read {filename} ({e}); starting with empty daily/weekly/monthly scores.")
+            return cls()
+
+    def _bucket(self, period, pid):
+        """The bucket for pid, creating it (and dropping the oldest) if it is the newest; None if expired."""
+        by_id = self.buckets[period]
+        bucket = by_id.get(pid)
+        if bucket is not None:
+            return bucket
+        if by_id and pid < next(reversed(by_id)):
+            return None  # older than the newest bucket and no longer kept
+        bucket = by_id[pid] = {}
+        while len(by_id) > RETENTION[period]:
+            del by_id[next(iter(by_id))]
+        return bucket
+
+    def add(self, event):
+        """Count one score log event (skipped by any bucket that already includes it)."""
+        key = GAME_KEYS[event["game"]]
+        for period in PERIODS:
+            bucket = self._bucket(period, period_id(period, event["ts"]))
+            if bucket is None:
+                continue
+            existing = bucket.get(event["user"], {})
+            if existing.get("last_event", 0) >= event["seq"]:
+                continue
+            entry = {
+                "name": event["name"],
+                "con_score": existing.get("con_score", 0),
+                "num_score": existing.get("num_score", 0),
+                "let_score": existing.get("let_score", 0),
+                "last_event": event["seq"],
+            }
+            entry[key] += event["points"]
+            # Replace rather than mutate, so the log thread always copies a whole entry
+            bucket[event["user"]] = entry
+
+    def get(self, period, offset=0, now=None):
+        """(period id, {user id: entry}) for the current period (offset 0) or an earlier one."""
+        now = datetime.datetime.now(datetime.timezone.utc) if now is None else now
+        if period == "day":
+            when = now - datetime.timedelta(days=offset)
+        elif period == "week":
+            when = now - datetime.timedelta(weeks=offset)
+        else:
+            when = now.replace(day=1)
+            for _ in range(offset):
+                when = (when - datetime.timedelta(days=1)).replace(day=1)
+        pid = period_id(period, when.timestamp())
+        return pid, self.buckets[period].get(pid, {})
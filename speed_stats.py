@@ -0,0 +1,110 @@
+"""
+Solve-speed statistics
+----------------------
+How long winning answers take, per player and per game, for `!speed`.
+Each series is a log-bucketed quantile sketch: a time t is counted in
+bucket ceil(log_gamma(t)), so any quantile is reported within ±2% of the
+true value, and since times are clamped to 0.1 s .. 1 day a sketch never
+has more than a few hundred buckets however many rounds it sees.
+
+Sketches are plain dicts so the score log can save them with its
+compactions. Each remembers the seq of the last event it counted, so
+replaying the log at startup counts each win exactly once.
+
+Usage (example):
+    from speed_stats import SpeedStats
+    speed = SpeedStats.load("speed_stats.json")
+    speed.add(event)                          # a score log event with "seconds"
+    speed.quantile("letters", 0.5, "123")     # player's median, or None
+"""
+
+import json
+import math
+
+from score_log import GAME_KEYS
+
+ACCURACY = 0.02
+GAMMA = (1 + ACCURACY) / (1 - ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+MIN_SECONDS = 0.1
+MAX_SECONDS = 86400.0
+
+
+def new_sketch():
+    return {"count": 0, "sum": 0.0, "min": None, "last_event": 0, "bins": {}}
+
+
+def sketch_add(sketch, seconds, seq) -> dict:
+    """A copy of the sketch with one more time counted (the original is left untouched)."""
+    seconds = min(max(seconds, MIN_SECONDS), MAX_SECONDS)
+    index = str(math.ceil(math.log(seconds) / LOG_GAMMA))  # str: JSON object keys
+    bins = dict(sketch["bins"])
+    bins[index] = bins.get(index, 0) + 1
+    return {
+        "count": sketch["count"] + 1,
+        "sum": sketch["sum"] + seconds,
+        "min": seconds if sketch["min"] is None else min(sketch["min"], seconds),
+        "last_event": seq,
+        "bins": bins,
+    }
+
+
+def sketch_quantile(sketch, q):
+    """Approximate q-quantile (0..1) of the counted times, or None if empty."""
+    if not sketch["count"]:
+        return None
+    rank = q * (sketch["count"] - 1)
+    seen = 0
+    for index in sorted(sketch["bins"], key=int):
+        seen += sketch["bins"][index]
+        if seen > rank:
+            # Midpoint of the bucket (gamma^(i-1), gamma^i], within ACCURACY of any value in it
+            return max(2 * GAMMA ** int(index) / (GAMMA + 1), sketch["min"])
+    return None
+
+
+class SpeedStats:
+    """Winning-time sketches per game and per (player, game)."""
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.games = data.get("games", {})  # game -> sketch
+        self.users = data.get("users", {})  # user id -> {game -> sketch}
+
+    @classmethod
+    def load(cls, filename):
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls()
+        except (ValueError, AttributeError) as e:
+            print(f"⚠️ Could not read {filename} ({e}); starting with empty speed statistics.")
+            return cls()
+
+    def to_dict(self):
+        return {"games": self.games, "users": self.users}
+
+    def add(self, event):
+        """Count the winning time of one score log event (if it has one)."""
+        seconds = event.get("seconds")
+        if seconds is None or event["game"] not in GAME_KEYS:
+            return
+        game, seq = event["game"], event["seq"]
+        sketch = self.games.get(game, new_sketch())
+        if sketch["last_event"] < seq:
+            self.games[game] = sketch_add(sketch, seconds, seq)
+        per_user = self.users.get(event["user"], {})
+        sketch = per_user.get(game, new_sketch())
+        if sketch["last_event"] < seq:
+            # Replace rather than mutate, so the log thread always copies a whole entry
+            self.users[event["user"]] = {**per_user, game: sketch_add(sketch, seconds, seq)}
+
+    def sketch(self, game, user_id=None):
+        if user_id is None:
+            return self.games.get(game)
+        return self.users.get(user_id, {}).get(game)
+
+    def quantile(self, game, q, user_id=None):
+        sketch = self.sketch(game, user_id)
+        return None if sketch is None else sketch_quantile(sketch, q)
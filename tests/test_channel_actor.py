@@ -0,0 +1,117 @@
+import asyncio
+
+from channel_actor import ChannelActor
+
+
+def test_messages_are_handled_one_at_a_time_in_order():
+    handled, running = [], []
+
+    async def handle(message):
+        running.append(message)
+        assert len(running) == 1  # never two at once
+        await asyncio.sleep(0.01)
+        handled.append(message)
+        running.remove(message)
+
+    async def main():
+        actor = ChannelActor("test", handle)
+        for i in range(5):
+            assert actor.submit(i)
+        await actor.queue.join()
+        actor.stop()
+        return actor
+
+    actor = asyncio.run(main())
+    assert handled == [0, 1, 2, 3, 4]
+    assert actor.processed == 5
+
+
+def test_messages_from_an_earlier_round_are_skipped():
+    round_id = ["round-1"]
+    handled = []
+
+    async def handle(message):
+        handled.append(message)
+        if message == "winning guess":
+            round_id[0] = "round-2"  # the win starts a new round
+
+    async def main():
+        actor = ChannelActor("test", handle, lambda: round_id[0])
+        actor.submit("winning guess")
+        actor.submit("second correct guess")  # queued during round 1
+        await actor.queue.join()
+        actor.submit("guess for round 2")
+        await actor.queue.join()
+        actor.stop()
+        return actor
+
+    actor = asyncio.run(main())
+    assert handled == ["winning guess", "guess for round 2"]
+    assert actor.stale == 1
+
+
+def test_full_queue_sheds_new_messages():
+    async def main():
+        release = asyncio.Event()
+
+        async def handle(message):
+            await release.wait()
+
+        actor = ChannelActor("test", handle, maxsize=3)
+        results = [actor.submit(i) for i in range(5)]
+        release.set()
+        await actor.queue.join()
+        actor.stop()
+        return actor, results
+
+    actor, results = asyncio.run(main())
+    assert results == [True, True, True, False, False]
+    assert actor.shed == 2
+    assert actor.processed == 3
+
+
+def test_a_failing_message_does_not_stop_the_channel():
+    handled = []
+
+    async def handle(message):
+        if message == "bad":
+            raise ValueError("bad message")
+        handled.append(message)
+
+    async def main():
+        actor = ChannelActor("test", handle)
+        actor.submit("bad")
+        actor.submit("good")
+        await actor.queue.join()
+        actor.stop()
+
+    asyncio.run(main())
+    assert handled == ["good"]
+
+
+def test_call_runs_after_a_round_change_and_waits_for_room():
+    round_id = ["round-1"]
+    handled = []
+
+    async def handle(message):
+        await asyncio.sleep(0.01)
+        handled.append(message)
+        if message == "winning guess":
+            round_id[0] = "round-2"
+
+    async def stop():
+        handled.append("stop")
+        return "stopped"
+
+    async def main():
+        actor = ChannelActor("test", handle, lambda: round_id[0], maxsize=2)
+        actor.submit("winning guess")
+        actor.submit("late guess")
+        result = await actor.call(stop)  # queue is full: waits, then runs in round 2
+        actor.stop()
+        return actor, result
+
+    actor, result = asyncio.run(main())
+    assert result == "stopped"
+    assert handled == ["winning guess", "stop"]
+    assert actor.shed == 0
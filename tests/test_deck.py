@@ -0,0 +1,46 @@
+import json
+
+from deck import DeckStore
+
+
+def test_each_item_once_per_cycle(tmp_path):
+    decks = DeckStore(str(tmp_path / "decks.json"))
+    items = [f"word{i}" for i in range(20)]
+    drawn = [decks.draw("any", items) for _ in range(20)]
+    decks.close()
+    assert sorted(drawn) == sorted(items)
+
+
+def test_filter_change_does_not_repeat(tmp_path):
+    decks = DeckStore(str(tmp_path / "decks.json"))
+    items = [f"word{i}" for i in range(30)]
+    evens = {w for i, w in enumerate(items) if i % 2 == 0}
+    drawn = [decks.draw("hard", items, accept=lambda w: w in evens) for _ in range(5)]
+    # A tier refresh changes membership, but words already dealt stay dealt
+    evens |= {"word0", "word1", "word3"}
+    deck = decks.decks["hard"]
+    left = sum(items[i] in evens for i in deck._order[deck.cursor:])
+    drawn += [decks.draw("hard", items, accept=lambda w: w in evens) for _ in range(left)]
+    decks.close()
+    assert len(set(drawn)) == len(drawn) == 5 + left
+
+
+def test_changed_list_of_same_size_restarts_deck(tmp_path):
+    filename = str(tmp_path / "decks.json")
+    decks = DeckStore(filename)
+    decks.draw("any", ["a", "b", "c"])
+    decks.close()
+    source = json.load(open(filename))["any"]["source"]
+
+    decks = DeckStore(filename)
+    assert decks.decks["any"].cursor == 1
+    decks.draw("any", ["x", "y", "z"])
+    decks.close()
+    saved = json.load(open(filename))["any"]
+    assert saved["source"] != source and saved["cursor"] == 1
+
+
+def test_nothing_accepted_returns_none(tmp_path):
+    decks = DeckStore(str(tmp_path / "decks.json"))
+    assert decks.draw("none", ["a", "b"], accept=lambda w: False) is None
+    decks.close()
@@ -0,0 +1,69 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from focaltools import FocalToolsClient, FocalToolsUnavailable
+
+
+def client_with(fetch):
+    """A client whose requests are answered by `fetch(arg)` instead of the API."""
+    client = FocalToolsClient(hedge=False)
+
+    async def fake_fetch(endpoint, arg, ip, timeout):
+        return await fetch(arg)
+
+    client._fetch = fake_fetch
+    return client
+
+
+def http_error(status):
+    return aiohttp.ClientResponseError(request_info=None, history=(), status=status)
+
+
+def test_client_errors_do_not_open_the_breaker():
+    async def fetch(arg):
+        raise http_error(400)
+
+    async def main():
+        client = client_with(fetch)
+        for i in range(10):
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.checkword(f"junk{i}")
+        return client
+
+    assert asyncio.run(main()).breaker.state == "closed"
+
+
+def test_server_errors_open_the_breaker():
+    async def fetch(arg):
+        raise http_error(503)
+
+    async def main():
+        client = client_with(fetch)
+        for i in range(5):
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.checkword(f"word{i}")
+        with pytest.raises(FocalToolsUnavailable):
+            await client.checkword("another")
+        return client
+
+    assert asyncio.run(main()).breaker.state == "open"
+
+
+def test_unexpected_error_in_trial_frees_the_next_trial():
+    async def fetch(arg):
+        if arg == "BOOM":
+            raise RuntimeError("bug")
+        return "true"
+
+    async def main():
+        client = client_with(fetch)
+        client.breaker.opened_at = 0.0  # long past the cooldown: half-open
+        with pytest.raises(RuntimeError):
+            await client.checkword("BOOM")
+        assert not client.breaker.trial_in_flight
+        assert await client.checkword("fine") == "true"
+        return client
+
+    assert asyncio.run(main()).breaker.state == "closed"
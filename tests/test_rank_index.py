@@ -0,0 +1,62 @@
+from rank_index import FenwickTree, RankIndex
+
+
+def test_fenwick_prefix_and_find_across_growth():
+    tree = FenwickTree(size=4)
+    tree.add(3, 2)
+    tree.add(10, 1)  # past the initial size
+    assert tree.prefix(2) == 0
+    assert tree.prefix(3) == 2
+    assert tree.prefix(100) == 3
+    assert tree.find(1) == 3
+    assert tree.find(3) == 10
+
+
+def test_top_is_highest_first_and_ties_in_arrival_order():
+    index = RankIndex()
+    index.update("a", 5)
+    index.update("b", 9)
+    index.update("c", 5)
+    index.update("d", 7)
+    assert index.top(10) == [("b", 9), ("d", 7), ("a", 5), ("c", 5)]
+    assert index.top(2) == [("b", 9), ("d", 7)]
+    assert index.total == 26
+
+
+def test_rank_matches_the_row_top_lists_the_player_on():
+    index = RankIndex()
+    for i in range(14):
+        index.update(f"ahead{i}", 100 - i)
+    for i in range(5):
+        index.update(f"tied{i}", 10)
+    rows = index.top(len(index))
+    for row, (user_id, score) in enumerate(rows, 1):
+        assert index.rank(user_id) == (row, score)
+    # Tied players past row 15 are not ranked 15 or better
+    assert index.rank("tied4") == (19, 10)
+
+
+def test_update_moves_and_removes_players():
+    index = RankIndex()
+    index.update("a", 3)
+    index.update("b", 2)
+    index.update("b", 4)
+    assert index.rank("b") == (1, 4)
+    assert index.rank("a") == (2, 3)
+    index.update("b", 0)
+    assert index.rank("b") is None
+    assert len(index) == 1
+    assert index.total == 3
+
+
+def test_rank_in_a_tie_bucket_after_players_leave_and_rejoin():
+    index = RankIndex()
+    for i in range(6):
+        index.update(f"p{i}", 1)
+    index.update("p1", 2)
+    index.update("p1", 1)  # back in the bucket, now its newest member
+    index.update("p3", 0)
+    rows = index.top(len(index))
+    assert [user_id for user_id, _ in rows] == ["p0", "p2", "p4", "p5", "p1"]
+    for row, (user_id, score) in enumerate(rows, 1):
+        assert index.rank(user_id) == (row, score)
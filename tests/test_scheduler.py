@@ -0,0 +1,71 @@
+import asyncio
+
+from scheduler import Scheduler
+
+
+def run_jobs(plan, wait=0.3):
+    """Run plan(scheduler, record) on a fresh scheduler; returns the names of the jobs that fired, in order."""
+    fired = []
+
+    def record(name):
+        async def job():
+            fired.append(name)
+        return job
+
+    async def main():
+        timers = Scheduler()
+        await plan(timers, record)
+        await asyncio.sleep(wait)
+        return timers
+
+    timers = asyncio.run(main())
+    return fired, timers
+
+
+def test_jobs_fire_in_deadline_order():
+    async def plan(timers, record):
+        timers.schedule("slow", 0.15, record("slow"))
+        timers.schedule("fast", 0.02, record("fast"))
+        timers.schedule("middle", 0.08, record("middle"))
+
+    fired, timers = run_jobs(plan)
+    assert fired == ["fast", "middle", "slow"]
+    assert timers.fired == 3
+    assert not timers.jobs
+
+
+def test_rescheduling_moves_the_deadline_either_way():
+    async def plan(timers, record):
+        timers.schedule("later", 0.02, record("later"))
+        timers.schedule("sooner", 0.2, record("sooner"))
+        timers.schedule("later", 0.15, record("later"))    # pushed back
+        timers.schedule("sooner", 0.05, record("sooner"))  # brought forward
+        await asyncio.sleep(0.1)
+        assert timers.pending("later")
+
+    fired, _ = run_jobs(plan)
+    assert fired == ["sooner", "later"]
+
+
+def test_cancelled_jobs_never_fire():
+    async def plan(timers, record):
+        timers.schedule("kept", 0.05, record("kept"))
+        timers.schedule("dropped", 0.02, record("dropped"))
+        assert timers.cancel("dropped")
+        assert not timers.cancel("dropped")
+
+    fired, timers = run_jobs(plan)
+    assert fired == ["kept"]
+    assert not timers.pending("dropped")
+
+
+def test_failing_job_is_counted_and_others_still_run():
+    async def plan(timers, record):
+        async def boom():
+            raise RuntimeError("boom")
+        timers.schedule("boom", 0.01, boom)
+        timers.schedule("after", 0.05, record("after"))
+
+    fired, timers = run_jobs(plan)
+    assert fired == ["after"]
+    assert timers.failed == 1
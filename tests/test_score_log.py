@@ -0,0 +1,88 @@
+import json
+
+from score_db import ScoreDB
+from score_log import ScoreLog, apply_event, load_scores, read_events
+
+
+def event(seq, user, game="letters", points=1):
+    return {"seq": seq, "ts": 0, "user": user, "name": user, "game": game, "points": points,
+            "bonus": None, "round": None, "seconds": None}
+
+
+def write_log(path, events):
+    path.write_text("".join(json.dumps(e) + "\n" for e in events), encoding="utf-8")
+
+
+def test_apply_event_skips_events_the_entry_already_includes():
+    scores = {}
+    assert apply_event(scores, event(1, "a"))
+    assert apply_event(scores, event(2, "a", "numbers", 2))
+    assert not apply_event(scores, event(2, "a", "numbers", 2))
+    assert not apply_event(scores, event(1, "a"))
+    assert scores["a"]["let_score"] == 1
+    assert scores["a"]["num_score"] == 2
+    assert scores["a"]["last_event"] == 2
+
+
+def test_replay_after_crash_applies_each_event_once(tmp_path):
+    scores_file, log_file = tmp_path / "scores.json", tmp_path / "events.log"
+    # The snapshot already includes events 1-2, but the crash left them in the log
+    scores_file.write_text(json.dumps({
+        "a": {"name": "a", "con_score": 0, "num_score": 0, "let_score": 2, "last_event": 2},
+    }))
+    write_log(log_file, [event(1, "a"), event(2, "a"), event(3, "a"), event(4, "b")])
+
+    scores, last_seq = load_scores(scores_file, log_file)
+    assert last_seq == 4
+    assert scores["a"]["let_score"] == 3
+    assert scores["b"]["let_score"] == 1
+
+    # Replaying the same log again changes nothing
+    again = json.loads(json.dumps(scores))
+    for e in read_events(log_file):
+        apply_event(again, e)
+    assert again == scores
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    log_file = tmp_path / "events.log"
+    log_file.write_text(json.dumps(event(1, "a")) + "\n" + '{"seq": 2, "us', encoding="utf-8")
+    assert [e["seq"] for e in read_events(log_file)] == [1]
+
+
+def test_close_compacts_and_restart_matches(tmp_path):
+    scores_file, log_file = tmp_path / "scores.json", tmp_path / "events.log"
+    scores, last_seq = load_scores(scores_file, log_file)
+    log = ScoreLog(str(log_file), str(scores_file), lambda: scores, last_seq)
+    for user, game in [("a", "letters"), ("b", "numbers"), ("a", "conundrum")]:
+        apply_event(scores, log.append(user, user, game, 1))
+    log.close()
+
+    assert list(read_events(log_file)) == []
+    assert [e["seq"] for e in read_events(tmp_path / "events.archive.log")] == [1, 2, 3]
+    restarted, restarted_seq = load_scores(scores_file, log_file)
+    assert restarted == scores
+    assert restarted_seq == 3
+
+
+def test_score_db_apply_is_idempotent(tmp_path):
+    db = ScoreDB(str(tmp_path / "scores.sqlite3"), None)
+    events = [event(1, "a"), event(2, "b", "numbers", 2), event(3, "a")]
+    db.apply(events)
+    db.apply(events)
+    db.apply(events[1:])
+    assert db.load()["a"]["let_score"] == 2
+    assert db.load()["b"]["num_score"] == 2
+    db.close()
+
+
+def test_db_applied_counts_database_writes(tmp_path):
+    db = ScoreDB(str(tmp_path / "scores.sqlite3"), None)
+    scores, last_seq = load_scores(None, tmp_path / "events.log", db=db)
+    log = ScoreLog(str(tmp_path / "events.log"), None, lambda: scores, last_seq, db=db)
+    assert log.db_applied == 0
+    apply_event(scores, log.append("a", "a", "letters", 1))
+    log.close()
+    assert log.db_applied >= 1
+    assert db.top("let_score") == [("a", "a", 1)]
+    db.close()
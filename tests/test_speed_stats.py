@@ -0,0 +1,31 @@
+import random
+
+from speed_stats import ACCURACY, SpeedStats, new_sketch, sketch_add, sketch_quantile
+
+
+def test_quantiles_are_within_the_sketch_accuracy():
+    rng = random.Random(1)
+    times = [rng.uniform(1, 300) for _ in range(2000)]
+    sketch = new_sketch()
+    for seq, seconds in enumerate(times, 1):
+        sketch = sketch_add(sketch, seconds, seq)
+    ordered = sorted(times)
+    for q in (0.1, 0.5, 0.9):
+        true = ordered[int(q * (len(ordered) - 1))]
+        assert abs(sketch_quantile(sketch, q) - true) <= true * ACCURACY * 1.01
+
+
+def test_quantile_never_below_the_best_time():
+    sketch = sketch_add(new_sketch(), 12.3, 1)
+    assert sketch_quantile(sketch, 0.5) >= 12.3
+    assert sketch_quantile(new_sketch(), 0.5) is None
+
+
+def test_each_event_is_counted_once():
+    stats = SpeedStats()
+    event = {"seq": 1, "user": "a", "game": "letters", "seconds": 5.0}
+    stats.add(event)
+    stats.add(event)  # replayed from the log
+    stats.add({"seq": 2, "user": "a", "game": "letters", "seconds": None})
+    assert stats.sketch("letters")["count"] == 1
+    assert stats.sketch("letters", "a")["count"] == 1
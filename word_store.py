@@ -0,0 +1,182 @@
+"""
+Compact word store
+------------------
+Holds a word list as one sorted, packed byte string plus an offsets array,
+instead of a list or set of Python str objects (~50+ bytes of overhead each).
+Lookups use binary search over the packed words, so membership and prefix
+queries are O(log n); anagram queries use a second index ordered by the
+word's sorted-letter signature.
+
+Usage (example):
+    from word_store import WordStore
+    store = WordStore.from_file("conundrums.txt")
+    "ABANDONED" in store          # membership
+    store.with_prefix("ABA")      # prefix query
+    store.anagrams("DEADNOBAN")   # words with exactly these letters
+    store.formable("ABANDONED", 5)  # 5-letter words from these letters
+"""
+
+import hashlib
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import combinations
+
+
+def signature(word: str) -> str:
+    """Sorted-letter signature shared by all anagrams of a word."""
+    return "".join(sorted(word.upper()))
+
+
+class _Words:
+    """Sequence view of the packed words (as bytes) for bisect."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, i):
+        return self.store._raw(i)
+
+
+class _Signatures:
+    """Sequence view of the packed words' signatures, in signature order."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, i):
+        return bytes(sorted(self.store._raw(self.store._by_sig[i])))
+
+
+class WordStore:
+    """Immutable, sorted, de-duplicated set of upper-case ASCII words."""
+
+    def __init__(self, words=()):
+        unique = sorted({w.strip().upper() for w in words if w.strip()})
+        self._build(unique)
+
+    @classmethod
+    def from_sorted(cls, words):
+        """Build from words that are already upper-case, sorted and unique."""
+        store = cls.__new__(cls)
+        store._build(words)
+        return store
+
+    @classmethod
+    def from_file(cls, filename: str):
+        """Build from the first tab-separated column of each line in a file."""
+        with open(filename, encoding="utf-8") as f:
+            return cls(line.split("\t", 1)[0] for line in f)
+
+    def _build(self, words):
+        encoded = [w.encode("ascii") for w in words]
+        self._blob = b"".join(encoded)
+        self._offsets = array("I", [0])
+        for w in encoded:
+            self._offsets.append(self._offsets[-1] + len(w))
+        # Word indices ordered by signature, for anagram lookups
+        self._by_sig = array("I", sorted(range(len(encoded)), key=lambda i: bytes(sorted(encoded[i]))))
+
+    def fingerprint(self) -> str:
+        """Short hash of the words, computed once (the store is immutable)."""
+        cached = getattr(self, "_fingerprint", None)
+        if cached is None:
+            digest = hashlib.blake2b(self._offsets.tobytes(), digest_size=8)
+            digest.update(self._blob)
+            cached = self._fingerprint = digest.hexdigest()
+        return cached
+
+    def _raw(self, i) -> bytes:
+        return self._blob[self._offsets[i]:self._offsets[i + 1]]
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i) -> str:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("word index out of range")
+        return self._raw(i).decode("ascii")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._raw(i).decode("ascii")
+
+    def index(self, word: str) -> int:
+        """Position of word in sorted order, or -1 if absent."""
+        try:
+            key = word.upper().encode("ascii")
+        except UnicodeEncodeError:
+            return -1
+        i = bisect_left(_Words(self), key)
+        if i < len(self) and self._raw(i) == key:
+            return i
+        return -1
+
+    def __contains__(self, word) -> bool:
+        return isinstance(word, str) and self.index(word) >= 0
+
+    def with_prefix(self, prefix: str) -> list:
+        """All words starting with prefix, in sorted order."""
+        key = prefix.upper().encode("ascii")
+        i = bisect_left(_Words(self), key)
+        out = []
+        while i < len(self) and self._raw(i).startswith(key):
+            out.append(self._raw(i).decode("ascii"))
+            i += 1
+        return out
+
+    def anagrams(self, letters: str) -> list:
+        """All words using exactly the given letters (in any order)."""
+        key = signature(letters).encode("ascii")
+        sigs = _Signatures(self)
+        i = bisect_left(sigs, key)
+        out = []
+        while i < len(self) and sigs[i] == key:
+            out.append(self._raw(self._by_sig[i]).decode("ascii"))
+            i += 1
+        return out
+
+    def formable(self, letters: str, length: int) -> list:
+        """Words of the given length using each of the letters at most once."""
+        letters = sorted(letters.upper())
+        out = []
+        for combo in sorted(set(combinations(letters, length))):
+            out.extend(self.anagrams("".join(combo)))
+        return sorted(out)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by this store."""
+        return (
+            sys.getsizeof(self._blob)
+            + sys.getsizeof(self._offsets)
+            + sys.getsizeof(self._by_sig)
+        )
+
+    def set_nbytes(self) -> int:
+        """
+        Approximate memory the same words would take as a plain set of str,
+        worked out from the counts rather than by building the set: each str
+        is a fixed header plus one byte per (ASCII) letter, and the set's
+        table of 16-byte slots is a power of two at most 60% full.
+        """
+        slots = 8
+        while slots * 3 < len(self) * 5:
+            slots *= 2
+        table = sys.getsizeof(set()) + 16 * (slots - 8)
+        return table + len(self) * sys.getsizeof("") + len(self._blob)
+
+    def memory_report(self, name="words") -> str:
+        packed = self.nbytes()
+        plain = self.set_nbytes()
+        return (
+            f"{name}: {len(self)} words in {packed / 1024:.0f} KiB "
+            f"(plain set: {plain / 1024:.0f} KiB, {plain / max(packed, 1):.1f}x)"
+        )
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Preprocessed word data snapshot
+-------------------------------
+Bundles everything the bot derives from its word files (the conundrum list
+and the valid/invalid history tables, with their anagram indexes) into one
+pickle, so a process start is a single file read instead of parsing ~150k
+lines.
+
+Build step (run after editing any of the word files; the Dockerfile runs it):
+    python wordlists.py
+
+At startup:
+    from wordlists import load_word_lists
+    word_lists = load_word_lists()
+
+If the snapshot is missing or out of date with the text files, the data is
+built from the text files instead (and the snapshot is not rewritten).
+
+While running, `word_files_changed(word_lists)` tells the bot when the text
+files have been edited so it can rebuild them in the background.
+"""
+
+import os
+import pickle
+import tempfile
+import time
+
+from history import VALID_FILE, INVALID_FILE, HistoryIndex, load_history_file
+from word_store import WordStore, signature
+
+CONUNDRUMS_FILE = "conundrums.txt"
+SNAPSHOT_FILE = "wordlists.snapshot"
+SOURCE_FILES = (CONUNDRUMS_FILE, VALID_FILE, INVALID_FILE)
+SNAPSHOT_VERSION = 3
+
+
+class WordLists:
+    """All preprocessed word data the bot uses."""
+
+    def __init__(self, conundrums: WordStore, history: HistoryIndex, sources=()):
+        self.conundrums = conundrums
+        self.history = history
+        self.sources = sources  # source_fingerprint() the data was built from
+
+    def valid_anagrams(self, word: str) -> list:
+        """Currently valid words with exactly the letters of word, from the history's signature index."""
+        return [w for w in self.history.valid.words.anagrams(word) if self.history.is_valid(w)]
+
+    def is_conundrum_answer(self, guess: str, answer: str) -> bool:
+        """True if guess is the answer or any other valid nine-letter anagram of it."""
+        guess = guess.upper()
+        if guess == answer.upper():
+            return True
+        return signature(guess) == signature(answer) and self.history.is_valid(guess)
+
+
+def source_fingerprint(files=SOURCE_FILES) -> tuple:
+    """(name, size, mtime) of each source file, so a stale snapshot can be detected."""
+    out = []
+    for name in files:
+        try:
+            st = os.stat(name)
+            out.append((name, st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            out.append((name, None, None))
+    return tuple(out)
+
+
+def build_word_lists(timings=None) -> WordLists:
+    """Parse the text files. Fills `timings` (name -> seconds) if given."""
+    timings = {} if timings is None else timings
+    # Taken before reading, so an edit made mid-build is picked up next time
+    sources = source_fingerprint()
+
+    start = time.perf_counter()
+    conundrums = WordStore.from_file(CONUNDRUMS_FILE)
+    timings["conundrums"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    valid = load_history_file(VALID_FILE)
+    timings["valid history"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    invalid = load_history_file(INVALID_FILE)
+    timings["invalid history"] = time.perf_counter() - start
+
+    return WordLists(conundrums, HistoryIndex(valid, invalid), sources)
+
+
+def save_snapshot(word_lists: WordLists, filename=SNAPSHOT_FILE):
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "sources": word_lists.sources,
+        "conundrums": word_lists.conundrums,
+        "valid": word_lists.history.valid,
+        "invalid": word_lists.history.invalid,
+    }
+    # A temp name of its own, so two saves running at once can't write into the same file
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(filename) + ".", suffix=".tmp",
+                               dir=os.path.dirname(filename) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def read_snapshot(filename=SNAPSHOT_FILE, timings=None) -> WordLists | None:
+    """Load the snapshot in one read, or return None if it's missing or stale."""
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    timings["snapshot read"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        payload = pickle.loads(data)
+    except Exception as e:
+        print(f"⚠️ Could not decode {filename}: {e}")
+        return None
+    timings["snapshot decode"] = time.perf_counter() - start
+
+    if payload.get("version") != SNAPSHOT_VERSION:
+        print(f"⚠️ {filename} was built by a different version; rebuilding from text files.")
+        return None
+    if payload.get("sources") != source_fingerprint():
+        print(f"⚠️ {filename} is out of date with the word files; rebuilding from text files.")
+        return None
+    return WordLists(
+        payload["conundrums"],
+        HistoryIndex(payload["valid"], payload["invalid"]),
+        payload["sources"],
+    )
+
+
+def load_word_lists(filename=SNAPSHOT_FILE) -> WordLists:
+    """Snapshot if fresh, otherwise the text files. Logs a timing breakdown."""
+    timings = {}
+    start = time.perf_counter()
+    word_lists = read_snapshot(filename, timings)
+    source = "snapshot"
+    if word_lists is None:
+        word_lists = build_word_lists(timings)
+        source = "text files"
+    total = time.perf_counter() - start
+
+    breakdown = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items())
+    print(f"⏱️ Word data loaded from {source} in {total * 1000:.0f} ms ({breakdown})")
+    return word_lists
+
+
+def word_files_changed(word_lists: WordLists) -> bool:
+    """True if the text files differ from the ones word_lists was built from."""
+    return source_fingerprint() != word_lists.sources
+
+
+def rebuild_word_lists() -> WordLists:
+    """Rebuild from the text files and refresh the snapshot. Safe to run in a worker thread."""
+    word_lists = build_word_lists()
+    try:
+        save_snapshot(word_lists)
+    except OSError as e:
+        print(f"⚠️ Could not write {SNAPSHOT_FILE}: {e}")
+    return word_lists
+
+
+if __name__ == "__main__":
+    timings = {}
+    word_lists = build_word_lists(timings)
+    save_snapshot(word_lists)
+    print(
+        f"✅ Wrote {SNAPSHOT_FILE}: {len(word_lists.conundrums)} conundrums, "
+        f"{len(word_lists.history.valid)} valid and {len(word_lists.history.invalid)} invalid history words "
+        f"({os.path.getsize(SNAPSHOT_FILE) / 1024:.0f} KiB, built in {sum(timings.values()) * 1000:.0f} ms)"
+    )